@@ -0,0 +1,25 @@
+"""
+``CACHES`` from ``REDIS_URL`` / ``MEMCACHED_LOCATION``.
+
+The tracker keeps things in the cache that every worker must see: response
+cache version tokens, authenticated users and the primary pins that follow
+a write (see ``tracker.caching``, ``tracker.authentication`` and
+``tracker.routers``). A per-process locmem cache would keep a write's
+invalidation on the worker that handled it while the others go on serving
+stale data, so without a shared server nothing is cached, except with
+``local`` (tests and ``DEBUG``, which run in one process).
+"""
+REDIS_BACKEND = 'django.core.cache.backends.redis.RedisCache'
+MEMCACHED_BACKEND = 'django.core.cache.backends.memcached.PyMemcacheCache'
+LOCMEM_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+DUMMY_BACKEND = 'django.core.cache.backends.dummy.DummyCache'
+
+
+def cache_settings(env, local=False):
+    if env.get('REDIS_URL'):
+        default = {'BACKEND': REDIS_BACKEND, 'LOCATION': env['REDIS_URL']}
+    elif env.get('MEMCACHED_LOCATION'):
+        default = {'BACKEND': MEMCACHED_BACKEND, 'LOCATION': env['MEMCACHED_LOCATION']}
+    else:
+        default = {'BACKEND': LOCMEM_BACKEND if local else DUMMY_BACKEND}
+    return {'default': default}
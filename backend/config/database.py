@@ -0,0 +1,70 @@
+"""
+``DATABASES`` from ``DB_*`` environment variables.
+
+Connection handling (``DB_CONNECTIONS``):
+- ``persistent`` (default): keep each connection open for ``DB_CONN_MAX_AGE``
+  seconds and health-check it before reuse after an error.
+- ``pool``: psycopg 3's native connection pool (``pip install "psycopg[pool]"``),
+  sized by ``DB_POOL_MIN_SIZE`` / ``DB_POOL_MAX_SIZE``. Prefer this under ASGI,
+  where persistent connections are not reused across requests.
+- ``none``: a new connection per request.
+
+Setting ``DB_REPLICA_HOST`` or ``DB_REPLICA_NAME`` adds a ``replica`` alias
+that ``tracker.routers.ReadReplicaRouter`` sends stats and list reads to; its
+other ``DB_REPLICA_*`` values default to the primary's. ``DB_ENGINE`` picks
+the backend (``postgresql`` by default; ``sqlite3`` for local stand-ins).
+"""
+from importlib.util import find_spec
+
+from django.core.exceptions import ImproperlyConfigured
+
+REPLICA_ALIAS = 'replica'
+CONNECTION_MODES = ('persistent', 'pool', 'none')
+FIELDS = ('NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')
+
+
+def backend(name):
+    return name if '.' in name else f'django.db.backends.{name}'
+
+
+def connection_settings(engine, env):
+    mode = env.get('DB_CONNECTIONS', 'persistent')
+    if mode == 'persistent':
+        return {
+            'CONN_MAX_AGE': int(env.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': env.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        }
+    if mode == 'pool':
+        if not engine.endswith('postgresql'):
+            raise ImproperlyConfigured('DB_CONNECTIONS=pool needs the postgresql backend.')
+        if find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured('DB_CONNECTIONS=pool needs psycopg 3 with its pool: pip install "psycopg[pool]".')
+        # Django's pool replaces persistent connections; it requires CONN_MAX_AGE = 0.
+        return {
+            'CONN_MAX_AGE': 0,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(env.get('DB_POOL_MIN_SIZE', 2)),
+                    'max_size': int(env.get('DB_POOL_MAX_SIZE', 10)),
+                    'timeout': int(env.get('DB_POOL_TIMEOUT', 10)),
+                },
+            },
+        }
+    if mode == 'none':
+        return {'CONN_MAX_AGE': 0}
+    raise ImproperlyConfigured(f'DB_CONNECTIONS must be one of: {", ".join(CONNECTION_MODES)}.')
+
+
+def database_settings(env):
+    engine = backend(env.get('DB_ENGINE', 'postgresql'))
+    primary = {'ENGINE': engine, **{field: env.get(f'DB_{field}') for field in FIELDS}}
+    primary.update(connection_settings(engine, env))
+    databases = {'default': primary}
+
+    if env.get('DB_REPLICA_HOST') or env.get('DB_REPLICA_NAME'):
+        replica = {**primary, **{field: env[f'DB_REPLICA_{field}'] for field in FIELDS if env.get(f'DB_REPLICA_{field}')}}
+        if not engine.endswith('sqlite3'):
+            # Tests must not try to create a database on a read-only server.
+            replica['TEST'] = {'MIRROR': 'default'}
+        databases[REPLICA_ALIAS] = replica
+    return databases
@@ -13,8 +13,12 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 import os
+import sys
 from dotenv import load_dotenv
 
+from .cache import DUMMY_BACKEND, cache_settings
+from .database import REPLICA_ALIAS, database_settings
+
 # Load environment variables from the .env file
 load_dotenv()
 
@@ -29,7 +33,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 SECRET_KEY = 'django-insecure-)p7e@*wkmgw5z@b=1r2l$s5@q0^h@jtl-a6^c&o(=ui11v$yj6'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-# DEBUG = True
+DEBUG = os.getenv('DJANGO_DEBUG', 'False') == 'True'
+
+# Running under ``manage.py test``.
+TESTING = sys.argv[1:2] == ['test']
 
 ALLOWED_HOSTS = ["*"]
 
@@ -49,7 +56,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Outermost so its timings cover the whole stack; removes itself when disabled.
+    'tracker.instrumentation.PerformanceMiddleware',
+    'tracker.middleware.AsyncWhiteNoiseMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -90,15 +99,63 @@ WSGI_APPLICATION = 'config.wsgi.application'
 #     }
 # }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.getenv('DB_NAME'),
-        'USER': os.getenv('DB_USER'),
-        'PASSWORD': os.getenv('DB_PASSWORD'),
-        'HOST': os.getenv('DB_HOST'),
-        'PORT': os.getenv('DB_PORT'),
-    }
+# DB_NAME, DB_USER, DB_PASSWORD, DB_HOST and DB_PORT, plus connection reuse,
+# pooling and an optional read replica; see config/database.py.
+DATABASES = database_settings(os.environ)
+
+DATABASE_ROUTERS = ['tracker.routers.ReadReplicaRouter']
+
+# Alias that stats and list reads go to, or None to read from the primary.
+# Tests read from the primary: a SQLite stand-in replica is a separate, empty
+# test database that only ReadReplicaTests fills and routes reads to.
+TRACKER_READ_REPLICA = REPLICA_ALIAS if REPLICA_ALIAS in DATABASES and not TESTING else None
+
+# Seconds a user's reads stay on the primary after they write, so that they
+# see their own changes while the replica catches up.
+TRACKER_REPLICA_LAG = int(os.getenv('DB_REPLICA_LAG', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# A shared Redis or Memcached server; without one, caching is off except for
+# tests and DEBUG, which get per-process locmem. See config/cache.py.
+
+CACHES = cache_settings(os.environ, local=DEBUG or TESTING)
+
+if CACHES['default']['BACKEND'] == DUMMY_BACKEND:
+    # The pins that keep a user's reads on the primary after a write live in
+    # the cache; without it, users could miss their own writes on the replica.
+    TRACKER_READ_REPLICA = None
+
+# Seconds a cached stats or category payload may live before it is recomputed.
+TRACKER_CACHE_TIMEOUT = int(os.getenv('TRACKER_CACHE_TIMEOUT', 300))
+
+# Seconds an authenticated user may be served from the cache instead of a
+# lookup per request. Saving or deleting the user drops it sooner.
+TRACKER_AUTH_CACHE_TIMEOUT = int(os.getenv('TRACKER_AUTH_CACHE_TIMEOUT', 60))
+
+# Range-partition the transaction table by month on PostgreSQL (migration 0008
+# and the manage_partitions command).
+TRACKER_PARTITION_TRANSACTIONS = os.getenv('TRACKER_PARTITION_TRANSACTIONS', 'False') == 'True'
+
+# Per-request timing: Server-Timing headers and a log line on 'tracker.performance'.
+# Requests over either budget are logged as warnings.
+TRACKER_PERFORMANCE = {
+    'ENABLED': os.getenv('TRACKER_PERF_ENABLED', 'False') == 'True',
+    'SERVER_TIMING': os.getenv('TRACKER_PERF_SERVER_TIMING', 'True') == 'True',
+    'QUERY_BUDGET': int(os.getenv('TRACKER_PERF_QUERY_BUDGET', 20)),
+    'LATENCY_BUDGET_MS': int(os.getenv('TRACKER_PERF_LATENCY_BUDGET_MS', 500)),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'tracker.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
 }
 
 
@@ -160,16 +217,18 @@ REST_FRAMEWORK = {
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
     ],
-    # 'DEFAULT_RENDERER_CLASSES': [
-    #     'rest_framework.renderers.JSONRenderer',  
-    # ],
+    # orjson when installed, else DRF's encoder; the browsable API in debug only.
+    'DEFAULT_RENDERER_CLASSES': [
+        'tracker.renderers.ORJSONRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
     'DEFAULT_PARSER_CLASSES': [
-        'rest_framework.parsers.JSONParser',
+        'tracker.parsers.ORJSONParser',
     ],
+    # The frontend sends Bearer tokens; sessions serve the browsable API. No
+    # BasicAuthentication: it would hash the password on every request.
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'tracker.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.BasicAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
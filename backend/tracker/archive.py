@@ -0,0 +1,85 @@
+"""
+Moves long-deleted rows out of the live tables.
+
+Soft-deleted rows stay in the live tables for ``sync`` tombstones and undo,
+but past that they only bloat the tables and their indexes. ``archive_deleted``
+copies rows deleted more than ``days`` ago into the ``Archived*`` tables
+(or just drops them with ``purge``) and deletes them from the live tables,
+one short transaction per batch. Rows a request is holding are skipped
+rather than waited on, and picked up by the next run.
+"""
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import (
+    ArchivedCategory,
+    ArchivedMonthlyBudget,
+    ArchivedTransaction,
+    Category,
+    MonthlyBudget,
+    MonthlyCategoryTotal,
+    Transaction,
+)
+
+ARCHIVE_BATCH_SIZE = 1000
+
+# Categories last: one can only go once its transactions have.
+ARCHIVES = (
+    (Transaction, ArchivedTransaction),
+    (MonthlyBudget, ArchivedMonthlyBudget),
+    (Category, ArchivedCategory),
+)
+
+
+def archivable(model, cutoff):
+    rows = model.all_with_deleted.filter(is_active=False, deleted_at__lt=cutoff)
+    if model is Category:
+        # Transactions, live or deleted, still point at it.
+        rows = rows.exclude(Exists(Transaction.all_with_deleted.filter(category=OuterRef('pk'))))
+    return rows
+
+
+def _move_batch(model, archive, cutoff, batch_size, purge):
+    with transaction.atomic():
+        ids = list(
+            archivable(model, cutoff)
+            .select_for_update(skip_locked=True)
+            .order_by('pk')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        rows = model.all_with_deleted.filter(pk__in=ids)
+        if not purge:
+            fields = [field.attname for field in archive._meta.concrete_fields if field.name != 'archived_at']
+            archive.objects.bulk_create(
+                [archive(**row) for row in rows.values(*fields)], ignore_conflicts=True
+            )
+        if model is Category:
+            # Left-over rollup rows; they sum no transactions any more.
+            totals = MonthlyCategoryTotal.objects.filter(category_id__in=ids)
+            totals._raw_delete(totals.db)
+        # A plain DELETE: nothing depends on these rows any more, and deleted
+        # rows have no cached stats for the post_delete receivers to invalidate.
+        rows._raw_delete(rows.db)
+    return len(ids)
+
+
+def archive_deleted(days, purge=False, batch_size=ARCHIVE_BATCH_SIZE, pause=0):
+    """
+    Archive (or ``purge``) every row soft-deleted more than ``days`` ago.
+    Sleeps ``pause`` seconds between batches. Returns counts per model.
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    moved = {}
+    for model, archive in ARCHIVES:
+        moved[model._meta.model_name] = 0
+        while count := _move_batch(model, archive, cutoff, batch_size, purge):
+            moved[model._meta.model_name] += count
+            if pause:
+                time.sleep(pause)
+    return moved
@@ -0,0 +1,163 @@
+"""
+Async versions of the read-heavy endpoints, mounted under ``/api/async/``.
+
+Served by ``config.asgi``, a request that is waiting on the database no
+longer holds a worker: the ORM calls go through Django's async queryset API
+(``afirst``, ``acount``, ``aiterator``) and the view awaits them. Payloads,
+caching, conditional GETs and status codes match the synchronous views.
+
+DRF's ``APIView`` is synchronous, so ``AsyncAPIView`` reuses its pieces
+(``Request``, the configured authenticators, permissions and exception
+handler) around an ``async`` handler and renders JSON only. Authentication
+may query the database and runs through ``sync_to_async``.
+"""
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from . import caching
+from .conditional import aevaluate, auser_validators
+from .instrumentation import serialize_timer
+from .listing import transaction_reader
+from .models import Category, MonthlyBudget, Transaction
+from .pagination import AsyncPageNumberPagination, KeysetPagination
+from .renderers import ORJSONRenderer
+from .routers import replica_alias, replica_reads, use_replica
+from .serializers import UserProfileSerializer
+from .stats import amonthly_stats, arange_stats
+from .views import CategoryViewSet, TransactionViewSet, stats_period
+
+
+class AsyncAPIView(View):
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'head']
+    renderer = ORJSONRenderer()
+    read_from_replica = True
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Like APIView: SessionAuthentication does its own CSRF checks.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        self.request = request
+        self.args = args
+        self.kwargs = kwargs
+        try:
+            # Resolves and caches request.user, which may query the database.
+            await sync_to_async(lambda: request.user)()
+            self.check_permissions(request)
+            method = request.method.lower()
+            handler = getattr(self, method, None) if method in self.http_method_names else None
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            replica = self.read_from_replica and replica_alias() and await sync_to_async(use_replica)(request)
+            with replica_reads(bool(replica)):
+                return await handler(request, *args, **kwargs)
+        except Exception as exc:
+            return self.handle_exception(exc)
+
+    def check_permissions(self, request):
+        for permission in [permission() for permission in self.permission_classes]:
+            if not permission.has_permission(request, self):
+                if request.authenticators and not request.successful_authenticator:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            authenticators = self.request.authenticators
+            auth_header = authenticators[0].authenticate_header(self.request) if authenticators else None
+            if auth_header:
+                exc.auth_header = auth_header
+            else:
+                exc.status_code = 403
+        context = {'view': self, 'args': self.args, 'kwargs': self.kwargs, 'request': self.request}
+        response = api_settings.EXCEPTION_HANDLER(exc, context)
+        return self.render(response.data, status=response.status_code)
+
+    def render(self, data, status=200):
+        return HttpResponse(self.renderer.render(data), content_type='application/json', status=status)
+
+    def viewset(self, viewset_class):
+        """The synchronous viewset's ``list`` action, for its queryset, filters and serializer."""
+        return viewset_class(request=self.request, args=self.args, kwargs=self.kwargs, format_kwarg=None, action='list')
+
+
+class MonthlyStatsAsyncView(AsyncAPIView):
+
+    async def get(self, request):
+        try:
+            start, end = stats_period(request.query_params)
+        except ValueError as exc:
+            return self.render({"error": str(exc)}, status=400)
+
+        user = request.user
+        validators = await auser_validators(user.id, [Transaction, Category, MonthlyBudget]) + [start, end]
+        if end is not None:
+            async def respond():
+                return self.render(await arange_stats(user, start, end))
+            return await aevaluate(request, validators, respond)
+
+        async def respond():
+            key = await sync_to_async(caching.stats_key)(user.id, start)
+            data, hit = await caching.aget_or_compute('stats', key, lambda: amonthly_stats(user, start))
+            response = self.render(data)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
+
+        return await aevaluate(request, validators, respond)
+
+
+class UserProfileAsyncView(AsyncAPIView):
+    read_from_replica = False
+
+    async def get(self, request):
+        return self.render(UserProfileSerializer(request.user).data)
+
+
+class TransactionListAsyncView(AsyncAPIView):
+
+    async def get(self, request):
+        view = self.viewset(TransactionViewSet)
+        paginator = KeysetPagination() if KeysetPagination.is_requested(request) else AsyncPageNumberPagination()
+
+        async def respond():
+            rows = transaction_reader.values(view.filter_queryset(view.get_queryset()))
+            page = await paginator.apaginate_queryset(rows, request, view=view)
+            with serialize_timer(request):
+                data = transaction_reader.read(page)
+            return self.render(paginator.get_paginated_response(data).data)
+
+        validators = await auser_validators(request.user.pk, view.conditional_models)
+        return await aevaluate(request, validators, respond)
+
+
+class CategoryListAsyncView(AsyncAPIView):
+
+    async def get(self, request):
+        view = self.viewset(CategoryViewSet)
+
+        async def payload():
+            categories = [category async for category in view.filter_queryset(view.get_queryset()).aiterator()]
+            data = view.get_serializer(categories, many=True).data
+            return {"count": len(data), "next": None, "previous": None, "results": data}
+
+        async def respond():
+            if request.query_params:
+                return self.render(await payload())
+            key = await sync_to_async(caching.categories_key)(request.user.id)
+            data, hit = await caching.aget_or_compute('categories', key, payload)
+            response = self.render(data)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
+
+        validators = await auser_validators(request.user.pk, view.conditional_models)
+        return await aevaluate(request, validators, respond)
@@ -0,0 +1,57 @@
+"""
+JWT authentication without a user lookup on every request.
+
+``JWTAuthentication`` fetches the token's user by primary key on each
+request. ``CachedJWTAuthentication`` keeps the user in the cache for
+``TRACKER_AUTH_CACHE_TIMEOUT`` seconds, and still checks ``is_active`` and
+token revocation against the cached copy. Saving or deleting a user drops
+the cached copy (see ``signals``), so deactivation and password changes
+apply on the next request.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+AUTH_CACHE_TIMEOUT = getattr(settings, 'TRACKER_AUTH_CACHE_TIMEOUT', 60)
+
+
+def user_cache_key(user_id):
+    return f'tracker:auth:user:{user_id}'
+
+
+def invalidate_user(user_id):
+    # As for the response cache: drop it now, and again on commit in case a
+    # concurrent request re-cached the row before this write committed.
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            # Raises for unknown, inactive and revoked users, so none are cached.
+            user = super().get_user(validated_token)
+            cache.set(key, user, AUTH_CACHE_TIMEOUT)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and (
+            validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password)
+        ):
+            raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,104 @@
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import caching, rollups
+from .filters import TransactionFilter
+from .models import Transaction
+
+BATCH_LIMIT = 1000
+
+ids_field = serializers.ListField(
+    child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BATCH_LIMIT
+)
+
+
+def _messages(errors):
+    """Flatten ``{name: [messages]}`` into ``['name: message', ...]``.
+
+    The API's exception handler flattens one level only, so nested errors
+    would reach the client as a dict's repr.
+    """
+    if not isinstance(errors, dict):
+        return [str(message) for message in errors]
+    return [f'{name}: {message}' for name, messages in errors.items() for message in _messages(messages)]
+
+
+def select_transactions(user, data):
+    """
+    The user's active transactions picked by ``data``: either ``{"ids": [...]}``
+    or ``{"filter": {...}}`` with the transaction list's filter parameters.
+    Ids of other users' or deleted transactions are ignored.
+    """
+    if not isinstance(data, dict) or ('ids' in data) == ('filter' in data):
+        raise serializers.ValidationError({'non_field_errors': ['Send either "ids" or "filter".']})
+    queryset = Transaction.objects.filter(user=user)
+
+    if 'ids' in data:
+        try:
+            return queryset.filter(pk__in=ids_field.run_validation(data['ids']))
+        except serializers.ValidationError as exc:
+            raise serializers.ValidationError({'ids': _messages(exc.detail)})
+
+    conditions = data['filter']
+    if not isinstance(conditions, dict) or not conditions:
+        raise serializers.ValidationError({'filter': ['Give at least one condition.']})
+    filterset = TransactionFilter(data=conditions, queryset=queryset)
+    unknown = sorted(set(conditions) - set(filterset.filters))
+    if unknown:
+        raise serializers.ValidationError({'filter': [f'Unknown condition "{name}".' for name in unknown]})
+    if not filterset.is_valid():
+        raise serializers.ValidationError({'filter': _messages(filterset.errors)})
+    return filterset.qs
+
+
+def _lock(queryset):
+    """Lock the selected rows and return their ids and rollup inputs."""
+    rows = list(
+        queryset.select_for_update()
+        .order_by('pk')
+        .values_list('pk', 'user_id', 'category_id', 'created_at', 'amount')[:BATCH_LIMIT + 1]
+    )
+    if len(rows) > BATCH_LIMIT:
+        raise serializers.ValidationError(
+            {'filter': [f'Matches more than {BATCH_LIMIT} transactions. Narrow it down.']}
+        )
+    return [row[0] for row in rows], [row[1:] for row in rows]
+
+
+def _apply(user, rows, deltas):
+    for key, (amount, count) in deltas.items():
+        rollups.apply_delta(key, amount, count)
+    # update() skips post_save, so invalidate the cached stats here.
+    if rows:
+        caching.invalidate_stats(user.id, {rollups.month_of(created_at) for _, _, created_at, _ in rows})
+
+
+def update_transactions(user, queryset, changes):
+    """
+    Set ``changes`` (``category`` and/or ``description``) on the selected rows
+    with one UPDATE, plus one rollup update per touched (month, category) when
+    the category changes. Returns the number of rows updated.
+    """
+    values = {'updated_at': timezone.now()}
+    if 'category' in changes:
+        values['category_id'] = changes['category'].pk
+    if 'description' in changes:
+        values['description'] = changes['description']
+
+    with transaction.atomic():
+        ids, rows = _lock(queryset)
+        updated = Transaction.objects.filter(pk__in=ids).update(**values)
+        deltas = rollups.batch_deltas(rows, values['category_id']) if 'category_id' in values else {}
+        _apply(user, rows, deltas)
+    return updated
+
+
+def delete_transactions(user, queryset):
+    """Soft-delete the selected rows with one UPDATE. Returns the number deleted."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids, rows = _lock(queryset)
+        deleted = Transaction.objects.filter(pk__in=ids).update(is_active=False, deleted_at=now, updated_at=now)
+        _apply(user, rows, rollups.batch_deltas(rows))
+    return deleted
@@ -0,0 +1,105 @@
+"""Shared helpers for the benchmark management commands."""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import CommandError
+from django.db import connection, connections
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Transaction
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies_ms, elapsed_s, queries=None):
+    summary = {
+        "requests": len(latencies_ms),
+        "p50_ms": round(percentile(latencies_ms, 50), 3),
+        "p95_ms": round(percentile(latencies_ms, 95), 3),
+        "p99_ms": round(percentile(latencies_ms, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies_ms), 3),
+        "throughput_rps": round(len(latencies_ms) / elapsed_s, 1) if elapsed_s else None,
+    }
+    if queries is not None:
+        summary["queries_per_request"] = round(statistics.fmean(queries), 2)
+    return summary
+
+
+@contextmanager
+def count_queries(using="default"):
+    """Count queries run on ``using`` inside the block; yields a one-item list."""
+    counter = [0]
+
+    def wrapper(execute, sql, params, many, context):
+        counter[0] += 1
+        return execute(sql, params, many, context)
+
+    with connections[using].execute_wrapper(wrapper):
+        yield counter
+
+
+def benchmark_user(username=None):
+    """``username``'s user, or by default the user with the most transactions."""
+    if username:
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"User {username} does not exist.")
+    busiest = Transaction.objects.values("user").annotate(rows=Count("id")).order_by("-rows").first()
+    if busiest is None:
+        raise CommandError("No transactions found. Run generate_data first.")
+    return User.objects.get(pk=busiest["user"])
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=settings.BASE_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    return {
+        "git_revision": git_revision(),
+        "timestamp": timezone.now().isoformat(),
+        "database": connection.vendor,
+        "django": django.get_version(),
+        "python": platform.python_version(),
+        "debug": settings.DEBUG,
+    }
+
+
+def write_results(path, results):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump(results, fh, indent=2, default=str)
+
+
+def compare(current, baseline, metric="p50_ms"):
+    """Yield ``(name, before, after, change%)`` for scenarios present in both runs."""
+    for name, result in current.items():
+        before = baseline.get(name, {}).get(metric)
+        after = result.get(metric)
+        if before and after is not None:
+            yield name, before, after, round((after - before) / before * 100, 1)
@@ -0,0 +1,123 @@
+"""
+Per-user response cache for the read-mostly tracker endpoints.
+
+Cached payloads are keyed on version tokens rather than deleted directly:
+writes bump the relevant token, which orphans every payload built on the old
+one. Tokens are stored without expiry; if one is evicted a fresh,
+time-based token takes its place, so stale payloads can never be revived.
+
+Versions per user:
+- ``categories``: the category list
+- ``stats``: every month's stats (category names and types appear in them)
+- ``stats:<YYYY-MM>``: one month's stats
+
+Invalidation also pins the user's reads to the primary database for a while
+(see ``routers``), so a lagging replica cannot refill the cache.
+"""
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from . import routers
+
+CACHE_TIMEOUT = getattr(settings, 'TRACKER_CACHE_TIMEOUT', 300)
+KEY_PREFIX = 'tracker'
+
+
+def _version_key(user_id, scope):
+    return f'{KEY_PREFIX}:v:{user_id}:{scope}'
+
+
+def _versions(keys):
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return ':'.join(str(found[key]) for key in keys)
+
+
+def _bump(keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def _bump_now_and_on_commit(keys):
+    # Bumping only now would let a concurrent reader re-cache pre-commit data;
+    # bumping only on commit would let this request read its own stale cache.
+    _bump(keys)
+    transaction.on_commit(lambda: _bump(keys))
+
+
+def categories_key(user_id):
+    version = _versions([_version_key(user_id, 'categories')])
+    return f'{KEY_PREFIX}:categories:{user_id}:{version}'
+
+
+def stats_key(user_id, month):
+    month_label = month.strftime('%Y-%m')
+    version = _versions([_version_key(user_id, 'stats'), _version_key(user_id, f'stats:{month_label}')])
+    return f'{KEY_PREFIX}:stats:{user_id}:{month_label}:{version}'
+
+
+def get_or_compute(name, key, compute):
+    """Return ``(value, hit)`` for ``key``, computing and storing it on a miss."""
+    value = cache.get(key)
+    hit = value is not None
+    if not hit:
+        value = compute()
+        cache.set(key, value, CACHE_TIMEOUT)
+    _count(name, hit)
+    return value, hit
+
+
+async def aget_or_compute(name, key, compute):
+    """``get_or_compute`` for async views, where ``compute`` is a coroutine function."""
+    value = await cache.aget(key)
+    hit = value is not None
+    if not hit:
+        value = await compute()
+        await cache.aset(key, value, CACHE_TIMEOUT)
+    await sync_to_async(_count)(name, hit)
+    return value, hit
+
+
+def invalidate_categories(user_id):
+    _bump_now_and_on_commit([_version_key(user_id, 'categories'), _version_key(user_id, 'stats')])
+    routers.pin_to_primary(user_id)
+
+
+def invalidate_stats(user_id, months):
+    _bump_now_and_on_commit([_version_key(user_id, f'stats:{month:%Y-%m}') for month in set(months)])
+    routers.pin_to_primary(user_id)
+
+
+def _counter_key(name, outcome):
+    return f'{KEY_PREFIX}:metrics:{name}:{outcome}'
+
+
+def _count(name, hit):
+    key = _counter_key(name, 'hits' if hit else 'misses')
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def counters(names=('categories', 'stats')):
+    keys = {(name, outcome): _counter_key(name, outcome) for name in names for outcome in ('hits', 'misses')}
+    values = cache.get_many(list(keys.values()))
+    report = {}
+    for name in names:
+        hits = values.get(keys[(name, 'hits')], 0)
+        misses = values.get(keys[(name, 'misses')], 0)
+        total = hits + misses
+        report[name] = {'hits': hits, 'misses': misses, 'hit_ratio': round(hits / total, 4) if total else None}
+    return report
@@ -0,0 +1,120 @@
+"""
+Conditional GET (ETag / Last-Modified) for tracker endpoints.
+
+Validators come from per-user ``max(updated_at)`` and row counts in a
+single aggregate query, so an unchanged resource is answered with
+``304 Not Modified`` without running the real queries or serializing
+anything. Soft-deletes go through ``save()`` and bump ``updated_at``, and
+counts catch hard deletes.
+"""
+import calendar
+import hashlib
+
+from django.contrib.auth.models import User
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def _user_validators_query(user_id, models):
+    annotations = {}
+    for index, model in enumerate(models):
+        rows = model._base_manager.filter(user=OuterRef('pk')).order_by().values('user')
+        annotations[f'latest_{index}'] = Subquery(rows.annotate(value=Max('updated_at')).values('value'))
+        annotations[f'count_{index}'] = Subquery(rows.annotate(value=Count('pk')).values('value'))
+    return User.objects.filter(pk=user_id).values(**annotations), list(annotations)
+
+
+def user_validators(user_id, models):
+    """Return ``[max(updated_at), count, ...]`` of ``user_id``'s rows in each of ``models``."""
+    query, names = _user_validators_query(user_id, models)
+    values = query.first() or {}
+    return [values.get(name) for name in names]
+
+
+async def auser_validators(user_id, models):
+    query, names = _user_validators_query(user_id, models)
+    values = await query.afirst() or {}
+    return [values.get(name) for name in names]
+
+
+def row_validators(model, user_id, pk, related=()):
+    """Return ``updated_at`` of one of the user's rows plus that of ``related`` FKs, or None."""
+    fields = ['updated_at'] + [f'{name}__updated_at' for name in related]
+    return model._base_manager.filter(pk=pk, user_id=user_id).values_list(*fields).first()
+
+
+def _precondition(request, validators):
+    """Return ``(etag, last_modified, 304 response or None)`` for ``validators``."""
+    django_request = getattr(request, '_request', request)
+    accepted = getattr(request, 'accepted_media_type', '')
+    fingerprint = repr((request.user.pk, request.get_full_path(), accepted, list(validators)))
+    etag = quote_etag(hashlib.md5(fingerprint.encode(), usedforsecurity=False).hexdigest())
+    timestamps = [value for value in validators if hasattr(value, 'utctimetuple')]
+    last_modified = calendar.timegm(max(timestamps).utctimetuple()) if timestamps else None
+    return etag, last_modified, get_conditional_response(django_request, etag=etag, last_modified=last_modified)
+
+
+def _add_validator_headers(response, etag, last_modified):
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # The payload is per user: let browsers keep it but always revalidate.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def evaluate(request, validators, respond):
+    """
+    Return 304 when the request's preconditions match ``validators``;
+    otherwise call ``respond()`` and attach ``ETag`` / ``Last-Modified``.
+    """
+    if validators is None:
+        return respond()
+    etag, last_modified, response = _precondition(request, validators)
+    if response is None:
+        response = respond()
+    return _add_validator_headers(response, etag, last_modified)
+
+
+async def aevaluate(request, validators, respond):
+    """``evaluate`` for async views, where ``respond`` is a coroutine function."""
+    if validators is None:
+        return await respond()
+    etag, last_modified, response = _precondition(request, validators)
+    if response is None:
+        response = await respond()
+    return _add_validator_headers(response, etag, last_modified)
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified handling to a viewset's ``list`` and ``retrieve``.
+
+    ``conditional_models`` lists every model whose rows end up in the
+    payload (e.g. transactions embed their category), and
+    ``conditional_related`` the FK names to check on detail requests.
+    """
+    conditional_models = ()
+    conditional_related = ()
+
+    def conditional_list(self, request, respond):
+        return evaluate(request, user_validators(request.user.pk, self.conditional_models), respond)
+
+    def conditional_retrieve(self, request, respond):
+        lookup = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        try:
+            validators = row_validators(self.conditional_models[0], request.user.pk, lookup, self.conditional_related)
+        except (TypeError, ValueError):
+            validators = None
+        return evaluate(request, validators, respond)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_retrieve(
+            request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
@@ -0,0 +1,72 @@
+"""
+Everything the dashboard's first paint needs, in one response.
+
+The dashboard used to load ``/profile/``, ``/monthly-budgets/current-month/``,
+``/categories/`` and ``/stats/`` separately, paying authentication,
+middleware and a connection for each. ``dashboard_payload`` builds the same
+four payloads, keyed ``profile``, ``budget``, ``categories`` and ``stats``,
+for one already-authenticated user:
+
+- ``profile`` comes from ``request.user`` and needs no query;
+- ``budget`` is one query, and its amount is reused when ``stats`` is for the
+  current month;
+- ``categories`` and ``stats`` go through the same per-user cache as their
+  own endpoints, so a warm dashboard costs the budget query plus the view's
+  conditional GET validators.
+
+``budget`` is ``null`` when the current month has no budget.
+"""
+from datetime import date
+
+from . import caching
+from .models import Category, MonthlyBudget
+from .serializers import CategorySerializer, MonthlyBudgetSerializer, UserProfileSerializer
+from .stats import category_totals, month_budget, summarize, total_rows
+
+SECTIONS = ('profile', 'budget', 'categories', 'stats')
+
+
+def parse_sections(value):
+    """The sections named in a comma-separated ``?include=``, all of them when empty."""
+    if not value:
+        return list(SECTIONS)
+    sections = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(sections) - set(SECTIONS))
+    if unknown or not sections:
+        raise ValueError(f"Unknown section: {', '.join(unknown)}. Choose from: {', '.join(SECTIONS)}.")
+    return [name for name in SECTIONS if name in sections]
+
+
+def category_list_payload(queryset):
+    """The category list response, as served (and cached) by ``/categories/``."""
+    data = CategorySerializer(queryset, many=True).data
+    return {"count": len(data), "next": None, "previous": None, "results": data}
+
+
+def dashboard_payload(user, sections, month):
+    """``sections`` of the dashboard for ``user``, with stats for ``month`` (first day)."""
+    payload = {}
+    current_month = date.today().replace(day=1)
+    budget = None
+    if 'budget' in sections:
+        budget = MonthlyBudget.objects.filter(user=user, month=current_month).first()
+
+    if 'profile' in sections:
+        payload['profile'] = UserProfileSerializer(user).data
+    if 'budget' in sections:
+        payload['budget'] = MonthlyBudgetSerializer(budget).data if budget is not None else None
+    if 'categories' in sections:
+        payload['categories'], _ = caching.get_or_compute(
+            'categories', caching.categories_key(user.id),
+            lambda: category_list_payload(Category.objects.filter(user=user)),
+        )
+    if 'stats' in sections:
+        def stats():
+            if 'budget' in sections and month == current_month:
+                amount = budget.amount if budget is not None else 0
+            else:
+                amount = month_budget(user, month).first() or 0
+            return summarize(month, amount, total_rows(category_totals(user, month=month)))
+
+        payload['stats'], _ = caching.get_or_compute('stats', caching.stats_key(user.id, month), stats)
+    return payload
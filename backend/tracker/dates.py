@@ -0,0 +1,26 @@
+"""
+Half-open ``[start, end)`` timestamp ranges for date and month filters.
+
+Comparing ``created_at`` against two precomputed instants keeps predicates
+sargable: the database can answer them with an index range scan, where
+``created_at__month`` or a date cast wraps the column in a function and
+forces every row of the user to be inspected. Boundaries are computed in the
+current timezone (the project's ``TIME_ZONE`` unless one is activated).
+"""
+from datetime import datetime, time
+
+from django.utils import timezone
+
+
+def day_start(day, tz=None):
+    return timezone.make_aware(datetime.combine(day, time.min), tz or timezone.get_current_timezone())
+
+
+def next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1, day=1)
+
+
+def month_bounds(month, tz=None):
+    """``[first instant of month, first instant of next month)`` for the month containing ``month``."""
+    first = month.replace(day=1)
+    return day_start(first, tz), day_start(next_month(first), tz)
@@ -0,0 +1,94 @@
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_COLUMNS = ['id', 'date', 'category', 'type', 'amount', 'description']
+EXPORT_FIELDS = ['id', 'created_at', 'category__name', 'category__type', 'amount', 'description']
+EXPORT_CHUNK_SIZE = 2000
+# Spreadsheet apps run a cell that starts with one of these as a formula.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def escape_cell(value):
+    """Quote free text that a spreadsheet would evaluate when opening a CSV (formula injection)."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_cell(value):
+    """Undo ``escape_cell``, so exported files import back unchanged."""
+    if isinstance(value, str) and value.startswith("'") and value[1:].startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+class Echo:
+    """File-like object whose write() just hands the line back to csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset):
+    """Yield plain tuples for ``queryset`` through a server-side cursor."""
+    rows = queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for pk, created_at, category, category_type, amount, description in rows:
+        yield pk, timezone.localtime(created_at), category, category_type, amount, description
+
+
+def csv_response(queryset, filename='transactions.csv'):
+    writer = csv.writer(Echo())
+
+    def lines():
+        yield writer.writerow(EXPORT_COLUMNS)
+        for pk, created_at, category, category_type, amount, description in export_rows(queryset):
+            yield writer.writerow([
+                pk, created_at.isoformat(), escape_cell(category), category_type, amount, escape_cell(description),
+            ])
+
+    return StreamingHttpResponse(
+        lines(),
+        content_type='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'},
+    )
+
+
+def xlsx_response(queryset, filename='transactions.xlsx'):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+
+    # Write-only workbooks flush rows to disk as they are appended, so memory
+    # stays flat; the finished file is then streamed from a temporary file.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Transactions')
+    sheet.append(EXPORT_COLUMNS)
+
+    def text(value):
+        # openpyxl stores strings starting with "=" as formulas; keep free
+        # text a plain string cell, unchanged.
+        cell = WriteOnlyCell(sheet, value)
+        if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+            cell.data_type = 's'
+        return cell
+
+    for pk, created_at, category, category_type, amount, description in export_rows(queryset):
+        sheet.append([pk, created_at.replace(tzinfo=None), text(category), category_type, amount, text(description)])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=filename,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    )
+
+
+EXPORTERS = {
+    'csv': csv_response,
+    'xlsx': xlsx_response,
+}
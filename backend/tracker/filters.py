@@ -1,13 +1,39 @@
+from datetime import timedelta
+
 import django_filters
+from django import forms
+from .dates import day_start, month_bounds
 from .models import Transaction
 
+
+class MonthField(forms.DateField):
+    input_formats = ['%Y-%m']
+
+
+class MonthFilter(django_filters.Filter):
+    field_class = MonthField
+
+
 class TransactionFilter(django_filters.FilterSet):
     amount_min = django_filters.NumberFilter(field_name="amount", lookup_expr="gte")
     amount_max = django_filters.NumberFilter(field_name="amount", lookup_expr="lte")
-    date_from = django_filters.DateFilter(field_name="created_at", lookup_expr="gte")
-    date_to = django_filters.DateFilter(field_name="created_at", lookup_expr="lte")
+    # Dates become half-open [start, end) ranges on created_at so the filters
+    # stay index range scans; date_to includes the whole of that day.
+    date_from = django_filters.DateFilter(method="filter_date_from")
+    date_to = django_filters.DateFilter(method="filter_date_to")
+    month = MonthFilter(method="filter_month")
     category = django_filters.NumberFilter(field_name="category_id")
 
     class Meta:
         model = Transaction
-        fields = ["category", "amount_min", "amount_max", "date_from", "date_to"]
+        fields = ["category", "amount_min", "amount_max", "date_from", "date_to", "month"]
+
+    def filter_date_from(self, queryset, name, value):
+        return queryset.filter(created_at__gte=day_start(value))
+
+    def filter_date_to(self, queryset, name, value):
+        return queryset.filter(created_at__lt=day_start(value + timedelta(days=1)))
+
+    def filter_month(self, queryset, name, value):
+        start, end = month_bounds(value)
+        return queryset.filter(created_at__gte=start, created_at__lt=end)
@@ -0,0 +1,211 @@
+import csv
+import io
+import zipfile
+from collections import defaultdict
+from datetime import date, datetime
+from itertools import islice
+from xml.etree import ElementTree
+
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from . import caching, rollups
+from .exports import unescape_cell
+from .models import Category, Transaction
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+# Field parsers are built once and reused for every row; running a full
+# serializer per row is what made one-POST-per-row imports slow.
+amount_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+date_field = serializers.DateTimeField()
+description_field = serializers.CharField(allow_blank=True, trim_whitespace=True)
+
+
+def read_rows(data, upload=None):
+    """Yield one dict per input row from a JSON array or an uploaded CSV/XLSX file."""
+    if upload is None:
+        if not isinstance(data, list):
+            raise serializers.ValidationError({'rows': 'Send a JSON array of rows or upload a CSV/XLSX file.'})
+        return iter(data)
+    name = (upload.name or '').lower()
+    if name.endswith('.xlsx'):
+        return _xlsx_rows(upload)
+    if name.endswith('.csv'):
+        return _csv_rows(upload)
+    raise serializers.ValidationError({'file': 'Only .csv and .xlsx files are supported.'})
+
+
+def _csv_rows(upload):
+    # Rows are imported in batches as they are read, so a file that cannot be
+    # decoded or parsed is rejected in a first pass, before any batch is saved.
+    text = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        for _ in csv.reader(text):
+            pass
+    except UnicodeDecodeError:
+        raise serializers.ValidationError({'file': 'The CSV file must be UTF-8 encoded.'})
+    except csv.Error as exc:
+        raise serializers.ValidationError({'file': f'The CSV file could not be read: {exc}.'})
+    text.seek(0)
+    return _csv_dicts(text)
+
+
+def _csv_dicts(text):
+    for row in csv.DictReader(text):
+        yield {(key or '').strip().lower(): value for key, value in row.items()}
+
+
+def _xlsx_rows(upload):
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    # Open the workbook now rather than on the first row, so a file that is
+    # not a workbook is rejected before anything is imported.
+    try:
+        workbook = load_workbook(upload.file, read_only=True, data_only=True)
+    except (InvalidFileException, zipfile.BadZipFile, KeyError, OSError):
+        raise serializers.ValidationError({'file': 'The file is not a valid .xlsx workbook.'})
+    return _xlsx_dicts(workbook)
+
+
+def _xlsx_dicts(workbook):
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(cell or '').strip().lower() for cell in next(rows, ())]
+        for values in rows:
+            if any(value not in (None, '') for value in values):
+                yield dict(zip(header, values))
+    except (zipfile.BadZipFile, ElementTree.ParseError):
+        raise serializers.ValidationError({'file': 'The worksheet is damaged and could not be read.'})
+    finally:
+        workbook.close()
+
+
+class CategoryResolver:
+    """Resolves a row's category by id or by name against one query of the user's categories."""
+
+    def __init__(self, user):
+        self.by_id = {}
+        self.by_name = {}
+        for pk, name_lower in (
+            Category.objects.filter(user=user)
+            .values_list('pk', Lower('name'))
+        ):
+            self.by_id[pk] = pk
+            self.by_name.setdefault(name_lower, pk)
+
+    def resolve(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, str)):
+            return None
+        # A number is an id, unless no category has it: then it may be a name
+        # such as "2024" (XLSX hands such cells over as ints).
+        text = str(value).strip()
+        if text.isdigit() and int(text) in self.by_id:
+            return int(text)
+        return self.by_name.get(text.lower())
+
+
+def parse_row(row, resolver):
+    """Return ``(values, None)`` for a valid row or ``(None, errors)``."""
+    if not isinstance(row, dict):
+        return None, {'non_field_errors': ['Expected an object.']}
+
+    errors = {}
+    values = {}
+
+    category = unescape_cell(row.get('category'))
+    if category in (None, ''):
+        errors['category'] = ['This field is required.']
+    else:
+        values['category_id'] = resolver.resolve(category)
+        if values['category_id'] is None:
+            errors['category'] = [f'Unknown category "{category}".']
+
+    for name, field, required in (
+        ('amount', amount_field, True),
+        ('date', date_field, False),
+        ('description', description_field, False),
+    ):
+        value = row.get(name)
+        if value in (None, ''):
+            if required:
+                errors[name] = ['This field is required.']
+            continue
+        if name == 'date' and isinstance(value, date) and not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        elif name == 'amount' and isinstance(value, float):
+            value = str(value)
+        elif name == 'description':
+            value = unescape_cell(str(value))
+        try:
+            values[name] = field.run_validation(value)
+        except serializers.ValidationError as exc:
+            errors[name] = exc.detail
+
+    if errors:
+        return None, errors
+    return values, None
+
+
+def import_transactions(user, rows):
+    """
+    Validate and insert ``rows`` for ``user`` in batches.
+
+    Each batch is one ``bulk_create`` plus one rollup update per touched
+    (month, category), committed on its own so a bad row never discards the
+    good ones. Returns a report with per-row errors (1-based row numbers).
+    """
+    resolver = CategoryResolver(user)
+    now = timezone.now()
+    created = 0
+    months = set()
+    failed = 0
+    errors = []
+    row_number = 0
+
+    rows = iter(rows)
+    while batch := list(islice(rows, IMPORT_BATCH_SIZE)):
+        objects = []
+        deltas = defaultdict(lambda: [0, 0])
+        for row in batch:
+            row_number += 1
+            values, row_errors = parse_row(row, resolver)
+            if row_errors:
+                failed += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'row': row_number, 'errors': row_errors})
+                continue
+            txn = Transaction(
+                user=user,
+                category_id=values['category_id'],
+                amount=values['amount'],
+                description=values.get('description', ''),
+                created_at=values.get('date', now),
+            )
+            objects.append(txn)
+            key, amount = rollups.contribution(txn)
+            deltas[key][0] += amount
+            deltas[key][1] += 1
+
+        if objects:
+            with transaction.atomic():
+                Transaction.objects.bulk_create(objects, batch_size=IMPORT_BATCH_SIZE)
+                for key, (amount, count) in deltas.items():
+                    rollups.apply_delta(key, amount, count)
+            created += len(objects)
+            months.update(month for _, _, month in deltas)
+
+    # bulk_create skips post_save, so invalidate the cached stats here.
+    if months:
+        caching.invalidate_stats(user.id, months)
+
+    return {
+        'created': created,
+        'failed': failed,
+        'errors': errors,
+        'errors_truncated': failed > len(errors),
+    }
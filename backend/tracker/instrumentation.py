@@ -0,0 +1,179 @@
+"""
+Optional per-request performance instrumentation.
+
+``PerformanceMiddleware`` records wall time, query count and database time
+(through ``connection.execute_wrapper``) and response size. Views using
+``InstrumentedViewMixin`` add serializer validation and serialization
+time. Results go out as a ``Server-Timing`` header and one structured log
+line per request on the ``tracker.performance`` logger. Requests that exceed
+the configured query or latency budget are logged as warnings.
+
+Configure with ``TRACKER_PERFORMANCE`` in settings. When ``ENABLED`` is
+false the middleware raises ``MiddlewareNotUsed`` and drops out of the
+stack entirely, and the mixin reduces to one attribute lookup. The
+middleware is async-capable, so it does not force ASGI requests onto a thread.
+"""
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager, nullcontext
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger('tracker.performance')
+
+DEFAULTS = {
+    'ENABLED': False,
+    'SERVER_TIMING': True,
+    'QUERY_BUDGET': 20,
+    'LATENCY_BUDGET_MS': 500,
+}
+
+
+def get_config():
+    return {**DEFAULTS, **getattr(settings, 'TRACKER_PERFORMANCE', {})}
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.queries = 0
+        self.db_ms = 0.0
+        self.timings = {}
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_ms += (time.perf_counter() - started) * 1000
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class PerformanceMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        config = get_config()
+        if not config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.server_timing = config['SERVER_TIMING']
+        self.query_budget = config['QUERY_BUDGET']
+        self.latency_budget_ms = config['LATENCY_BUDGET_MS']
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = request.perf = RequestMetrics()
+        started = time.perf_counter()
+        with ExitStack() as wrappers:
+            self.wrap_connections(wrappers, metrics)
+            response = self.get_response(request)
+        return self.finish(request, response, metrics, started)
+
+    async def __acall__(self, request):
+        metrics = request.perf = RequestMetrics()
+        started = time.perf_counter()
+        # Connections are per thread, and the async ORM runs its queries on
+        # the request's sync thread, so the wrappers are installed there.
+        wrappers = ExitStack()
+        await sync_to_async(self.wrap_connections)(wrappers, metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(wrappers.close)()
+        return self.finish(request, response, metrics, started)
+
+    def wrap_connections(self, stack, metrics):
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(metrics.execute_wrapper))
+
+    def finish(self, request, response, metrics, started):
+        total_ms = (time.perf_counter() - started) * 1000
+        size = None if response.streaming else len(response.content)
+        if self.server_timing:
+            response['Server-Timing'] = self.server_timing_header(metrics, total_ms)
+        self.log(request, response, metrics, total_ms, size)
+        return response
+
+    def server_timing_header(self, metrics, total_ms):
+        entries = [f'db;dur={metrics.db_ms:.2f};desc="{metrics.queries} queries"']
+        entries += [f'{name};dur={value:.2f}' for name, value in metrics.timings.items()]
+        entries.append(f'total;dur={total_ms:.2f}')
+        return ', '.join(entries)
+
+    def log(self, request, response, metrics, total_ms, size):
+        over_budget = []
+        if self.query_budget is not None and metrics.queries > self.query_budget:
+            over_budget.append('queries')
+        if self.latency_budget_ms is not None and total_ms > self.latency_budget_ms:
+            over_budget.append('latency')
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'user': getattr(getattr(request, 'user', None), 'pk', None),
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(metrics.db_ms, 2),
+            'queries': metrics.queries,
+            **{f'{name}_ms': round(value, 2) for name, value in metrics.timings.items()},
+            'response_bytes': size,
+            'over_budget': over_budget,
+        }
+        level = logging.WARNING if over_budget else logging.INFO
+        logger.log(level, json.dumps(record), extra={'performance': record})
+
+
+class TimedSerializer:
+    """Proxy that times ``is_valid()`` and ``.data`` on the wrapped serializer."""
+
+    def __init__(self, serializer, metrics):
+        self.__dict__['_serializer'] = serializer
+        self.__dict__['_metrics'] = metrics
+
+    def __getattr__(self, name):
+        return getattr(self._serializer, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._serializer, name, value)
+
+    def is_valid(self, *args, **kwargs):
+        with self._metrics.timer('validate'):
+            return self._serializer.is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with self._metrics.timer('serialize'):
+            return self._serializer.data
+
+
+def serialize_timer(request):
+    """Times serialization done without a serializer, e.g. ``tracker.listing``."""
+    metrics = getattr(getattr(request, '_request', request), 'perf', None)
+    return nullcontext() if metrics is None else metrics.timer('serialize')
+
+
+class InstrumentedViewMixin:
+    """Reports serializer validation and serialization time to ``PerformanceMiddleware``."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        metrics = getattr(self.request._request, 'perf', None)
+        if metrics is None:
+            return serializer
+        return TimedSerializer(serializer, metrics)
@@ -0,0 +1,132 @@
+"""
+Read-only list output built from ``values_list`` rows instead of model instances.
+
+Rendering a page through ``TransactionSerializer`` builds a model instance and
+a category instance per row, then walks a ``ModelSerializer`` field tree (with
+a nested ``CategorySerializer``) for each of them. ``RowReader`` compiles that
+serializer's readable fields once into a column list and a layout of
+``(key, column index, converter)`` entries. A page is then one
+``values_list`` query, joined to the category, and one dict per row.
+
+The converters are the serializer fields' own ``to_representation``, except
+for fields that hand database values through unchanged and for ISO 8601
+datetimes, whose converter looks the current timezone up once per page
+instead of once per value. The output is the serializer's output: same keys,
+same order, same values.
+"""
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.settings import api_settings
+
+from .serializers import TransactionSerializer
+
+# Fields whose to_representation returns the value the database driver
+# already gives back, so they need no converter.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+)
+
+
+class RowReader:
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self._compiled = None
+
+    def compile(self):
+        # Built on first use: instantiating a ModelSerializer's fields needs
+        # the app registry.
+        if self._compiled is None:
+            columns = []
+            layout = self._layout(self.serializer_class(), '', columns)
+            self._compiled = columns, layout
+        return self._compiled
+
+    def _layout(self, serializer, prefix, columns):
+        layout = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if '.' in field.source or field.source == '*':
+                raise ImproperlyConfigured(f'{type(self).__name__} cannot read {name!r}: source {field.source!r}.')
+            source = prefix + field.source
+            if isinstance(field, serializers.BaseSerializer):
+                if getattr(field, 'many', False):
+                    raise ImproperlyConfigured(f'{type(self).__name__} cannot read to-many field {name!r}.')
+                layout.append((name, None, self._layout(field, source + '__', columns)))
+                continue
+            if isinstance(field, PrimaryKeyRelatedField):
+                if field.pk_field is not None:
+                    raise ImproperlyConfigured(f'{type(self).__name__} cannot read {name!r}: pk_field is set.')
+                convert = None
+            elif isinstance(field, PASSTHROUGH_FIELDS) or type(field) is serializers.ReadOnlyField:
+                convert = None
+            elif _is_iso_datetime(field):
+                convert = _iso_datetime
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.RelatedField)):
+                raise ImproperlyConfigured(f'{type(self).__name__} cannot read {name!r}: not a column.')
+            else:
+                convert = field.to_representation
+            layout.append((name, len(columns), convert))
+            columns.append(source)
+        return layout
+
+    def values(self, queryset):
+        """``queryset`` as named rows; pagination reads ``created_at`` and ``id`` off them."""
+        columns, _ = self.compile()
+        return queryset.values_list(*columns, named=True)
+
+    def read(self, rows):
+        """The serializer's ``.data`` for ``rows`` from ``values()``."""
+        _, layout = self.compile()
+        layout = _bind(layout, timezone.get_current_timezone())
+        return [_build(row, layout) for row in rows]
+
+
+def _is_iso_datetime(field):
+    # Fields with their own timezone keep DRF's conversion.
+    return (
+        isinstance(field, serializers.DateTimeField)
+        and settings.USE_TZ
+        and not hasattr(field, 'timezone')
+        and (getattr(field, 'format', api_settings.DATETIME_FORMAT) or '').lower() == ISO_8601
+    )
+
+
+def _iso_datetime(tz):
+    """``DateTimeField.to_representation`` for aware values, with the timezone bound."""
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _bind(layout, tz):
+    bound = []
+    for name, index, convert in layout:
+        if index is None:
+            convert = _bind(convert, tz)
+        elif convert is _iso_datetime:
+            convert = _iso_datetime(tz)
+        bound.append((name, index, convert))
+    return bound
+
+
+def _build(row, layout):
+    data = {}
+    for name, index, convert in layout:
+        if index is None:
+            data[name] = _build(row, convert)
+            continue
+        value = row[index]
+        data[name] = value if convert is None or value is None else convert(value)
+    return data
+
+
+transaction_reader = RowReader(TransactionSerializer)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.archive import ARCHIVE_BATCH_SIZE, archive_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        "Move categories, transactions and budgets soft-deleted more than --days ago from the live tables "
+        "into the archive tables, in short batches. With --purge they are deleted instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=30, help="Only rows deleted more than this many days ago.")
+        parser.add_argument("--purge", action="store_true", help="Delete the rows instead of archiving them.")
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE, help="Rows per transaction.")
+        parser.add_argument("--pause", type=float, default=0, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, **options):
+        if options["days"] < 0 or options["batch_size"] < 1 or options["pause"] < 0:
+            raise CommandError("--days and --pause cannot be negative, and --batch-size must be at least 1.")
+
+        moved = archive_deleted(
+            options["days"], purge=options["purge"], batch_size=options["batch_size"], pause=options["pause"]
+        )
+        verb = "Purged" if options["purge"] else "Archived"
+        summary = ", ".join(f"{count} {name} rows" for name, count in moved.items())
+        self.stdout.write(self.style.SUCCESS(f"{verb} {summary}."))
@@ -0,0 +1,259 @@
+import json
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.test import Client
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tracker import rollups
+from tracker.benchmarking import benchmark_user, compare, count_queries, environment, summarize, write_results
+from tracker.models import Category, MonthlyBudget, Transaction
+
+IMPORT_MARKER = "benchmark-import"
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the endpoints in tracker/urls.py, including the async/ views and, with --writes, the "
+        "create/update/delete, import and bulk-update/bulk-delete actions, through the Django test client "
+        "against the configured database and report p50/p95/p99 latency, queries per request and throughput."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to benchmark as. Defaults to the user with most transactions.")
+        parser.add_argument("--iterations", type=int, default=50, help="Timed requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per scenario.")
+        parser.add_argument("--writes", action="store_true", help="Also benchmark create/update/delete endpoints.")
+        parser.add_argument("--scenario", action="append", help="Only run scenarios whose name contains this.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+        parser.add_argument("--compare", help="Earlier JSON results to compare p50 latency against.")
+
+    def handle(self, *args, **options):
+        user = benchmark_user(options["user"])
+        self.client = Client(headers={"Authorization": f"Bearer {AccessToken.for_user(user)}"})
+        self.user = user
+        self.created_users = []
+        self.created_transactions = []
+        self.created_categories = []
+
+        scenarios = self.read_scenarios()
+        if options["writes"]:
+            scenarios += self.write_scenarios()
+        if options["scenario"]:
+            scenarios = [s for s in scenarios if any(part in s[0] for part in options["scenario"])]
+
+        results = {}
+        try:
+            for name, request, *setup in scenarios:
+                results[name] = self.run_scenario(request, options["iterations"], options["warmup"], *setup)
+                self.report(name, results[name])
+        finally:
+            self.cleanup()
+
+        if options["output"]:
+            write_results(options["output"], {
+                "environment": environment(),
+                "user": {"id": user.pk, "transactions": Transaction.objects.filter(user=user).count()},
+                "iterations": options["iterations"],
+                "results": results,
+            })
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                baseline = json.load(fh)["results"]
+            self.stdout.write(self.style.MIGRATE_HEADING("p50 vs baseline"))
+            for name, before, after, change in compare(results, baseline):
+                self.stdout.write(f"{name:<34} {before:>9.2f} -> {after:>9.2f} ms  ({change:+.1f}%)")
+
+    def request(self, method, path, data=None, **extra):
+        if method in ("post", "put", "patch"):
+            extra.setdefault("content_type", "application/json")
+            data = json.dumps(data)
+        response = getattr(self.client, method)(path, data, **extra)
+        if response.streaming:
+            # Include the time to produce the body of streamed exports.
+            b"".join(response.streaming_content)
+        if response.status_code >= 400:
+            raise CommandError(f"{method.upper()} {path} returned {response.status_code}: {response.content[:200]}")
+        return response
+
+    def read_scenarios(self):
+        user = self.user
+        category = Category.objects.filter(user=user).first()
+        txn = Transaction.objects.filter(user=user).order_by("-created_at").first()
+        budget = MonthlyBudget.objects.filter(user=user).order_by("-month").first()
+        if not (category and txn and budget):
+            raise CommandError("The benchmark user needs at least one category, transaction and budget.")
+        month = timezone.localdate().strftime("%Y-%m")
+        year = timezone.localdate().year
+        pages = max(1, Transaction.objects.filter(user=user).count() // 5)
+        # An incremental sync: just the most recent second of changes.
+        latest = Transaction.objects.filter(user=user).aggregate(latest=Max("updated_at"))["latest"]
+        since = (latest - timedelta(seconds=1)).isoformat()
+
+        return [
+            ("categories.list", lambda: self.request("get", "/api/categories/")),
+            ("categories.retrieve", lambda: self.request("get", f"/api/categories/{category.pk}/")),
+            ("transactions.list", lambda: self.request("get", "/api/transactions/")),
+            ("transactions.list.deep_page", lambda: self.request("get", f"/api/transactions/?page={pages}")),
+            ("transactions.list.cursor", lambda: self.request("get", "/api/transactions/?pagination=cursor")),
+            ("transactions.list.filtered", lambda: self.request(
+                "get", f"/api/transactions/?month={month}&amount_min=10&category={category.pk}")),
+            ("transactions.list.search", lambda: self.request("get", "/api/transactions/?search=lunch")),
+            ("transactions.retrieve", lambda: self.request("get", f"/api/transactions/{txn.pk}/")),
+            ("transactions.export.csv", lambda: self.request("get", f"/api/transactions/export/?month={month}")),
+            ("transactions.export.xlsx", lambda: self.request(
+                "get", f"/api/transactions/export/?month={month}&file_format=xlsx")),
+            ("monthly_budgets.list", lambda: self.request("get", "/api/monthly-budgets/")),
+            ("monthly_budgets.retrieve", lambda: self.request("get", f"/api/monthly-budgets/{budget.pk}/")),
+            ("monthly_budgets.current_month", self.current_month_budget),
+            ("stats.month", lambda: self.request("get", "/api/stats/")),
+            ("stats.year", lambda: self.request("get", f"/api/stats/?year={year}")),
+            ("stats.series.month", lambda: self.request("get", "/api/stats/series/")),
+            ("stats.series.year_by_week", lambda: self.request(
+                "get", f"/api/stats/series/?date_from={year}-01-01&date_to={year}-12-31&bucket=week")),
+            ("dashboard", lambda: self.request("get", "/api/dashboard/")),
+            ("profile", lambda: self.request("get", "/api/profile/")),
+            ("sync.since", lambda: self.request("get", "/api/sync/", {"since": since})),
+            ("cache_stats", self.cache_stats),
+            ("async.stats.month", lambda: self.request("get", "/api/async/stats/")),
+            ("async.profile", lambda: self.request("get", "/api/async/profile/")),
+            ("async.transactions.list", lambda: self.request("get", "/api/async/transactions/")),
+            ("async.categories.list", lambda: self.request("get", "/api/async/categories/")),
+        ]
+
+    def current_month_budget(self):
+        # 404 is a valid answer when the user has no budget this month.
+        return self.client.get("/api/monthly-budgets/current-month/")
+
+    def cache_stats(self):
+        staff = getattr(self, "staff_client", None)
+        if staff is None:
+            admin = User.objects.create(username=f"bench-staff-{uuid.uuid4().hex[:8]}", is_staff=True)
+            self.created_users.append(admin.pk)
+            staff = self.staff_client = Client(headers={"Authorization": f"Bearer {AccessToken.for_user(admin)}"})
+        return staff.get("/api/cache-stats/")
+
+    def write_scenarios(self):
+        category = Category.objects.filter(user=self.user).first()
+        budget = MonthlyBudget.objects.filter(user=self.user).order_by("-month").first()
+        created = {}
+
+        def create_transaction():
+            response = self.request("post", "/api/transactions/", {"category": category.pk, "amount": "12.34"})
+            created.setdefault("transactions", []).append(response.json()["id"])
+            self.created_transactions.append(response.json()["id"])
+
+        def update_transaction():
+            self.request("patch", f"/api/transactions/{created['transactions'][-1]}/", {"amount": "43.21"})
+
+        def delete_transaction():
+            self.request("delete", f"/api/transactions/{created['transactions'].pop()}/")
+
+        def create_category():
+            response = self.request("post", "/api/categories/", {"name": f"Bench {uuid.uuid4().hex}", "type": "expense"})
+            created.setdefault("categories", []).append(response.json()["id"])
+            self.created_categories.append(response.json()["id"])
+
+        def update_category():
+            self.request("patch", f"/api/categories/{created['categories'][-1]}/", {"name": f"Bench {uuid.uuid4().hex}"})
+
+        def delete_category():
+            self.request("delete", f"/api/categories/{created['categories'].pop()}/")
+
+        def import_rows():
+            rows = [{"category": category.pk, "amount": "1.00", "description": IMPORT_MARKER}] * 10
+            self.request("post", "/api/transactions/import/", rows)
+
+        def batch_ids():
+            # Batch actions work on rows the benchmark imported itself.
+            if "batch" not in created:
+                rows = [{"category": category.pk, "amount": "1.00", "description": IMPORT_MARKER}] * 10
+                self.request("post", "/api/transactions/import/", rows)
+                imported = Transaction.objects.filter(user=self.user, description=IMPORT_MARKER)
+                created["batch"] = list(imported.values_list("pk", flat=True)[:10])
+            return created["batch"]
+
+        def bulk_update():
+            changes = {"description": IMPORT_MARKER}
+            self.request("post", "/api/transactions/bulk-update/", {"ids": batch_ids(), "changes": changes})
+
+        def bulk_delete():
+            self.request("post", "/api/transactions/bulk-delete/", {"ids": batch_ids()})
+
+        def restore_batch():
+            # Untimed: bring the rows back so every bulk-delete deletes ten.
+            # cleanup() rebuilds the rollups this skips.
+            Transaction.all_with_deleted.filter(pk__in=batch_ids()).update(is_active=True, deleted_at=None)
+
+        def register():
+            email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+            response = self.request("post", "/api/register/", {
+                "first_name": "Bench", "last_name": "User", "email": email, "password": "benchmark-password",
+            })
+            self.created_users.append(response.json()["id"])
+
+        scenarios = [
+            ("transactions.create", create_transaction),
+            ("transactions.update", update_transaction),
+            ("transactions.delete", delete_transaction),
+            ("categories.create", create_category),
+            ("categories.update", update_category),
+            ("categories.delete", delete_category),
+            ("transactions.import.10_rows", import_rows),
+            ("transactions.bulk_update.10_rows", bulk_update),
+            ("transactions.bulk_delete.10_rows", bulk_delete, restore_batch),
+            ("register", register),
+        ]
+        if budget is not None:
+            scenarios.append((
+                "monthly_budgets.update",
+                lambda: self.request("patch", f"/api/monthly-budgets/{budget.pk}/", {"amount": str(budget.amount)}),
+            ))
+        return scenarios
+
+    def run_scenario(self, request, iterations, warmup, setup=None):
+        """Time ``request``; ``setup``, if given, runs untimed before every call."""
+        setup = setup or (lambda: None)
+        # One counted request doubles as the first warm-up request.
+        setup()
+        with count_queries() as queries:
+            request()
+        for _ in range(max(0, warmup - 1)):
+            setup()
+            request()
+
+        latencies = []
+        elapsed = 0
+        for _ in range(iterations):
+            setup()
+            begin = time.perf_counter()
+            request()
+            latencies.append((time.perf_counter() - begin) * 1000)
+            elapsed += time.perf_counter() - begin
+        return summarize(latencies, elapsed, queries=queries)
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<34} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+            f"p99 {result['p99_ms']:>8.2f} ms  {result['queries_per_request']:>5.1f} q/req  "
+            f"{result['throughput_rps']:>8.1f} req/s"
+        )
+
+    def cleanup(self):
+        # Deleting through the API only soft-deletes, so remove the rows for good.
+        created = Transaction.all_with_deleted.filter(user=self.user, pk__in=self.created_transactions)
+        imported = Transaction.all_with_deleted.filter(user=self.user, description=IMPORT_MARKER)
+        if created.exists() or imported.exists():
+            created.delete()
+            imported.delete()
+            rollups.rebuild(user=self.user)
+        Category.all_with_deleted.filter(user=self.user, pk__in=self.created_categories).delete()
+        if self.created_users:
+            User.objects.filter(pk__in=self.created_users).delete()
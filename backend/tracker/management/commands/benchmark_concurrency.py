@@ -0,0 +1,178 @@
+import asyncio
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from tracker.benchmarking import benchmark_user, environment, summarize, write_results
+from tracker.models import Transaction
+
+# (name, path under /api/); the ASGI run requests the /api/async/ version.
+SCENARIOS = [
+    ("stats.month", "stats/"),
+    ("stats.year", "stats/?year={year}"),
+    ("profile", "profile/"),
+    ("transactions.list", "transactions/"),
+    ("transactions.list.cursor", "transactions/?pagination=cursor"),
+    ("categories.list", "categories/"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-compare the synchronous endpoints served by the WSGI handler (a thread per client, as with a "
+        "threaded WSGI server) with their async versions served by the ASGI handler (a task per client on "
+        "one event loop), at the same number of concurrent clients. Requests go through the full "
+        "middleware stack against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to benchmark as. Defaults to the user with most transactions.")
+        parser.add_argument("--clients", type=int, default=16, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=25, help="Timed requests per client per scenario.")
+        parser.add_argument("--scenario", action="append", help="Only run scenarios whose name contains this.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1 or options["requests"] < 1:
+            raise CommandError("--clients and --requests must be at least 1.")
+        user = benchmark_user(options["user"])
+        self.authorization = f"Bearer {AccessToken.for_user(user)}"
+        self.wsgi = WSGIHandler()
+        self.asgi = ASGIHandler()
+
+        year = timezone.localdate().year
+        scenarios = [(name, path.format(year=year)) for name, path in SCENARIOS]
+        if options["scenario"]:
+            scenarios = [s for s in scenarios if any(part in s[0] for part in options["scenario"])]
+
+        results = {}
+        for name, path in scenarios:
+            wsgi = self.run_wsgi(f"/api/{path}", options["clients"], options["requests"])
+            asgi = asyncio.run(self.run_asgi(f"/api/async/{path}", options["clients"], options["requests"]))
+            results[name] = {"wsgi": wsgi, "asgi": asgi}
+            self.report(name, wsgi, asgi)
+
+        if options["output"]:
+            write_results(options["output"], {
+                "environment": environment(),
+                "user": {"id": user.pk, "transactions": Transaction.objects.filter(user=user).count()},
+                "clients": options["clients"],
+                "requests_per_client": options["requests"],
+                "results": results,
+            })
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def raise_for_status(self, path, status):
+        if status >= 400:
+            raise CommandError(f"GET {path} returned {status}.")
+
+    def wsgi_get(self, path):
+        url = urlsplit(path)
+        environ = {
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": url.path,
+            "QUERY_STRING": url.query,
+            "SERVER_NAME": "testserver",
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": self.authorization,
+            "wsgi.input": io.BytesIO(),
+            "wsgi.errors": io.StringIO(),
+            "wsgi.url_scheme": "http",
+            "wsgi.version": (1, 0),
+            "wsgi.multithread": True,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        status = []
+        body = self.wsgi(environ, lambda line, headers, exc_info=None: status.append(int(line.split()[0])))
+        try:
+            for _ in body:
+                pass
+        finally:
+            body.close()  # fires request_finished, as a server would
+        self.raise_for_status(path, status[0])
+
+    def wsgi_client(self, path, requests):
+        self.wsgi_get(path)  # warm-up
+        latencies = []
+        for _ in range(requests):
+            begin = time.perf_counter()
+            self.wsgi_get(path)
+            latencies.append((time.perf_counter() - begin) * 1000)
+        return latencies
+
+    def run_wsgi(self, path, clients, requests):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            per_client = list(pool.map(lambda _: self.wsgi_client(path, requests), range(clients)))
+        elapsed = time.perf_counter() - started
+        return summarize([latency for latencies in per_client for latency in latencies], elapsed)
+
+    async def asgi_get(self, path):
+        url = urlsplit(path)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": url.path,
+            "raw_path": url.path.encode(),
+            "query_string": url.query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", self.authorization.encode())],
+            "client": ("127.0.0.1", 0),
+            "server": ("testserver", 80),
+        }
+        request_sent = False
+        disconnected = asyncio.get_running_loop().create_future()
+        status = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            # The client stays connected; the handler cancels this wait when it is done.
+            return await disconnected
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await self.asgi(scope, receive, send)
+        self.raise_for_status(path, status[0])
+
+    async def asgi_client(self, path, requests):
+        await self.asgi_get(path)  # warm-up
+        latencies = []
+        for _ in range(requests):
+            begin = time.perf_counter()
+            await self.asgi_get(path)
+            latencies.append((time.perf_counter() - begin) * 1000)
+        return latencies
+
+    async def run_asgi(self, path, clients, requests):
+        started = time.perf_counter()
+        per_client = await asyncio.gather(*(self.asgi_client(path, requests) for _ in range(clients)))
+        elapsed = time.perf_counter() - started
+        return summarize([latency for latencies in per_client for latency in latencies], elapsed)
+
+    def report(self, name, wsgi, asgi):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        for label, result in (("wsgi", wsgi), ("asgi", asgi)):
+            self.stdout.write(
+                f"  {label}  p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+                f"p99 {result['p99_ms']:>8.2f} ms  {result['throughput_rps']:>8.1f} req/s"
+            )
+        change = (asgi["throughput_rps"] - wsgi["throughput_rps"]) / wsgi["throughput_rps"] * 100
+        self.stdout.write(f"  asgi throughput vs wsgi: {change:+.1f}%")
@@ -0,0 +1,92 @@
+import json
+import random
+import statistics
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from tracker import rollups
+from tracker.dates import month_bounds
+from tracker.models import Category, Transaction
+
+BENCH_USERNAME = 'bench-date-filters@example.com'
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the monthly stats aggregation filtered with created_at__year/__month "
+        "against the half-open [start, end) range, printing EXPLAIN plans and timings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1_000_000, help="Transactions to seed for the bench user.")
+        parser.add_argument("--months", type=int, default=36, help="Months of history to spread rows over.")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant.")
+        parser.add_argument("--json", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        user = self.seed(options["rows"], options["months"])
+        month = timezone.localdate().replace(day=1)
+        start, end = month_bounds(month)
+
+        base = Transaction.objects.filter(user=user, category__is_active=True)
+        variants = {
+            "year_month_extract": base.filter(created_at__year=month.year, created_at__month=month.month),
+            "half_open_range": base.filter(created_at__gte=start, created_at__lt=end),
+        }
+
+        results = {}
+        for name, queryset in variants.items():
+            queryset = (
+                queryset.values(category_type=F("category__type"), category_name=F("category__name"))
+                .annotate(total_amount=Sum("amount"))
+            )
+            plan = queryset.explain()
+            timings = []
+            for _ in range(options["repeat"]):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {"median_ms": round(statistics.median(timings), 2), "plan": plan}
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}: median {results[name]['median_ms']} ms"))
+            self.stdout.write(plan)
+
+        if options["json"]:
+            with open(options["json"], "w") as fh:
+                json.dump({"vendor": connection.vendor, "rows": options["rows"], "results": results}, fh, indent=2)
+
+    def seed(self, rows, months):
+        user, _ = User.objects.get_or_create(username=BENCH_USERNAME, defaults={"email": BENCH_USERNAME})
+        existing = Transaction.objects.filter(user=user).count()
+        if existing >= rows:
+            return user
+
+        categories = [
+            Category.objects.get_or_create(user=user, name=name, defaults={"type": kind})[0]
+            for name, kind in (("Salary", "income"), ("Rent", "expense"), ("Food", "expense"), ("Travel", "expense"))
+        ]
+        now = timezone.now()
+        span = timedelta(days=30 * months).total_seconds()
+        rng = random.Random(42)
+        batch_size = 10_000
+        self.stdout.write(f"Seeding {rows - existing} transactions...")
+        for offset in range(existing, rows, batch_size):
+            Transaction.objects.bulk_create(
+                Transaction(
+                    user=user,
+                    category=rng.choice(categories),
+                    amount=Decimal(rng.randint(100, 50_000)) / 100,
+                    created_at=now - timedelta(seconds=rng.random() * span),
+                )
+                for _ in range(min(batch_size, rows - offset))
+            )
+        rollups.rebuild(user=user)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        return user
@@ -0,0 +1,134 @@
+import io
+import random
+import statistics
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from tracker.benchmarking import environment, write_results
+from tracker.models import Category, Transaction
+from tracker.parsers import ORJSONParser
+from tracker.renderers import ORJSONRenderer, orjson
+from tracker.serializers import TransactionSerializer
+from tracker.stats import range_payload
+
+CATEGORIES = (("Salary", "income"), ("Rent", "expense"), ("Food", "expense"), ("Travel", "expense"), ("Bills", "expense"))
+
+
+class Command(BaseCommand):
+    help = (
+        "Time serializing, rendering and parsing a transaction list page and a multi-month stats payload, "
+        "with DRF's stdlib JSON renderer and parser (before) and the orjson ones (after). Runs in memory; "
+        "no database rows are needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000, help="Transactions in the list payload.")
+        parser.add_argument("--months", type=int, default=24, help="Months in the stats payload.")
+        parser.add_argument("--repeat", type=int, default=20, help="Timed runs per step; the median is reported.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["months"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows, --months and --repeat must be at least 1.")
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed: the 'after' path falls back to stdlib json."))
+        self.repeat = options["repeat"]
+
+        transactions = self.transactions(options["rows"])
+        serialize_ms, data = self.time(lambda: TransactionSerializer(transactions, many=True).data)
+        payloads = {
+            "transactions": {"results": data},
+            "stats": self.stats(options["months"]),
+        }
+
+        results = {"transactions.serialize": {"ms": serialize_ms}}
+        for name, payload in payloads.items():
+            for stage, before, after in (
+                ("render", JSONRenderer().render, ORJSONRenderer().render),
+                ("parse", self.parser(JSONParser()), self.parser(ORJSONParser())),
+            ):
+                argument = payload if stage == "render" else JSONRenderer().render(payload)
+                before_ms, rendered = self.time(lambda: before(argument))
+                after_ms, _ = self.time(lambda: after(argument))
+                results[f"{name}.{stage}"] = {
+                    "before_ms": before_ms,
+                    "after_ms": after_ms,
+                    "speedup": round(before_ms / after_ms, 2) if after_ms else None,
+                }
+                if stage == "render":
+                    results[f"{name}.{stage}"]["bytes"] = len(rendered)
+
+        self.report(results)
+        if options["output"]:
+            write_results(options["output"], {
+                "environment": environment(),
+                "orjson": getattr(orjson, "__version__", None),
+                "rows": options["rows"],
+                "months": options["months"],
+                "results": results,
+            })
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def time(self, work):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            result = work()
+            timings.append((time.perf_counter() - started) * 1000)
+        return round(statistics.median(timings), 3), result
+
+    def parser(self, parser):
+        return lambda body: parser.parse(io.BytesIO(body), parser_context={"encoding": "utf-8"})
+
+    def transactions(self, rows):
+        """Unsaved transactions shaped like a list page, with their categories attached."""
+        rng = random.Random(42)
+        user = User(pk=1, username="bench-json@example.com")
+        now = timezone.now()
+        categories = [
+            Category(pk=pk, user=user, name=name, type=kind, created_at=now, updated_at=now)
+            for pk, (name, kind) in enumerate(CATEGORIES, start=1)
+        ]
+        transactions = []
+        for pk in range(1, rows + 1):
+            created_at = now - timedelta(minutes=rng.randrange(60 * 24 * 365))
+            transactions.append(Transaction(
+                pk=pk, user=user, category=rng.choice(categories),
+                amount=Decimal(rng.randrange(100, 500_000)) / 100,
+                description=f"Bench transaction {pk}", created_at=created_at, updated_at=created_at,
+            ))
+        return transactions
+
+    def stats(self, months):
+        """A range stats payload: raw Decimal totals per month and category."""
+        rng = random.Random(42)
+        end = timezone.localdate().replace(day=1)
+        start = end
+        for _ in range(months - 1):
+            start = (start - timedelta(days=1)).replace(day=1)
+        totals = defaultdict(list)
+        month = start
+        while month <= end:
+            for name, kind in CATEGORIES:
+                totals[month].append((kind, name, Decimal(rng.randrange(100, 5_000_000)) / 100))
+            month = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+        budgets = {month: Decimal("2500.00") for month in totals}
+        return range_payload(start, end, budgets, totals)
+
+    def report(self, results):
+        for name, result in results.items():
+            if "ms" in result:
+                self.stdout.write(f"{name:<26} {result['ms']:>9.3f} ms")
+                continue
+            self.stdout.write(
+                f"{name:<26} before {result['before_ms']:>9.3f} ms  after {result['after_ms']:>9.3f} ms  "
+                f"x{result['speedup']}"
+            )
@@ -0,0 +1,89 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from tracker.benchmarking import benchmark_user, environment, write_results
+from tracker.listing import transaction_reader
+from tracker.models import Transaction
+from tracker.serializers import TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time one page of the transaction list through TransactionSerializer over model instances (before) "
+        "and through tracker.listing over values_list rows (after), per page size. Reports the query plus "
+        "serialization and serialization alone, per row. Uses the busiest user unless --username is given; "
+        "run generate_data first."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--username", help="User whose transactions are listed.")
+        parser.add_argument("--page-sizes", default="10,25,50,100", help="Comma-separated page sizes.")
+        parser.add_argument("--repeat", type=int, default=50, help="Timed runs per step; the median is reported.")
+        parser.add_argument("--output", help="Write results as JSON to this path.")
+
+    def handle(self, *args, **options):
+        try:
+            page_sizes = [int(size) for size in options["page_sizes"].split(",")]
+        except ValueError:
+            raise CommandError("--page-sizes must be comma-separated integers.")
+        if options["repeat"] < 1 or min(page_sizes) < 1:
+            raise CommandError("--page-sizes and --repeat must be at least 1.")
+        self.repeat = options["repeat"]
+
+        user = benchmark_user(options["username"])
+        queryset = Transaction.objects.filter(user=user).select_related("category").order_by("-created_at", "-id")
+        # Compile the reader outside the timings, as a running server would have.
+        transaction_reader.compile()
+
+        results = {}
+        for size in page_sizes:
+            serialize = lambda page: TransactionSerializer(page, many=True).data
+            fetch_before, _ = self.time(lambda: serialize(list(queryset[:size])))
+            fetch_after, _ = self.time(lambda: transaction_reader.read(transaction_reader.values(queryset)[:size]))
+
+            instances = list(queryset[:size])
+            rows = list(transaction_reader.values(queryset)[:size])
+            before, expected = self.time(lambda: serialize(instances))
+            after, data = self.time(lambda: transaction_reader.read(rows))
+            if JSONRenderer().render(data) != JSONRenderer().render(expected):
+                raise CommandError(f"Output differs from TransactionSerializer at page size {size}.")
+
+            count = len(rows) or 1
+            results[f"page_{size}"] = {
+                "rows": len(rows),
+                "query_and_serialize_us_per_row": self.per_row(fetch_before, fetch_after, count),
+                "serialize_us_per_row": self.per_row(before, after, count),
+            }
+
+        self.report(results)
+        if options["output"]:
+            write_results(options["output"], {"environment": environment(), "user": user.username, "results": results})
+            self.stdout.write(f"Results written to {options['output']}")
+
+    def time(self, work):
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            result = work()
+            timings.append((time.perf_counter() - started) * 1_000_000)
+        return statistics.median(timings), result
+
+    def per_row(self, before_us, after_us, rows):
+        return {
+            "before": round(before_us / rows, 2),
+            "after": round(after_us / rows, 2),
+            "speedup": round(before_us / after_us, 2) if after_us else None,
+        }
+
+    def report(self, results):
+        for name, result in results.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name} ({result['rows']} rows)"))
+            for step in ("query_and_serialize_us_per_row", "serialize_us_per_row"):
+                timing = result[step]
+                self.stdout.write(
+                    f"  {step:<32} before {timing['before']:>8.2f} us  after {timing['after']:>8.2f} us  "
+                    f"x{timing['speedup']}"
+                )
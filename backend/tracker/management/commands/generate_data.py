@@ -0,0 +1,187 @@
+import multiprocessing
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from tracker import rollups
+from tracker.models import Category, MonthlyBudget, Transaction
+
+# name, type, relative frequency, median amount
+CATEGORY_PROFILES = [
+    ("Salary", "income", 0, Decimal("4200")),
+    ("Freelance", "income", 2, Decimal("600")),
+    ("Interest", "income", 1, Decimal("15")),
+    ("Rent", "expense", 0, Decimal("1400")),
+    ("Groceries", "expense", 30, Decimal("55")),
+    ("Dining", "expense", 20, Decimal("28")),
+    ("Transport", "expense", 18, Decimal("12")),
+    ("Utilities", "expense", 4, Decimal("90")),
+    ("Entertainment", "expense", 8, Decimal("35")),
+    ("Shopping", "expense", 10, Decimal("70")),
+    ("Health", "expense", 3, Decimal("60")),
+    ("Travel", "expense", 2, Decimal("400")),
+]
+# Categories with frequency 0 recur exactly once a month.
+MONTHLY = {name for name, _, weight, _ in CATEGORY_PROFILES if weight == 0}
+DESCRIPTIONS = {
+    "Groceries": ["Supermarket", "Farmers market", "Corner shop"],
+    "Dining": ["Lunch", "Coffee", "Dinner out", "Takeaway"],
+    "Transport": ["Metro card", "Taxi", "Fuel", "Parking"],
+    "Shopping": ["Clothes", "Electronics", "Books", "Home goods"],
+}
+BATCH_SIZE = 5000
+
+
+def insert_transactions(user_ids, categories, months, per_user, seed):
+    """Generate and bulk insert ``per_user`` transactions for each of ``user_ids``; returns the row count."""
+    rng = random.Random(seed)
+    created = 0
+    rows = generate_transactions(user_ids, categories, months, per_user, rng)
+    while batch := list(islice(rows, BATCH_SIZE)):
+        Transaction.objects.bulk_create(batch)
+        created += len(batch)
+    return created
+
+
+def generate_transactions(user_ids, categories, months, per_user, rng):
+    profiles = {name: (weight, float(median)) for name, _, weight, median in CATEGORY_PROFILES}
+    by_user = {}
+    for user_id, category_id, name in categories:
+        by_user.setdefault(user_id, []).append((category_id, name))
+    tz = timezone.get_current_timezone()
+    now = timezone.now()
+
+    def build(user_id, category, month, day):
+        category_id, name = category
+        # Log-normal spend: mostly near the median with a long tail of big purchases.
+        amount = min(profiles[name][1] * rng.lognormvariate(0, 0.6), 99_999_999.99)
+        created_at = datetime(month.year, month.month, day, rng.randint(7, 22), rng.randint(0, 59), tzinfo=tz)
+        return Transaction(
+            user_id=user_id,
+            category_id=category_id,
+            amount=Decimal(f"{amount:.2f}"),
+            description=rng.choice(DESCRIPTIONS.get(name, [name])),
+            created_at=min(created_at, now),
+        )
+
+    for user_id in user_ids:
+        owned = by_user.get(user_id, [])
+        recurring = [category for category in owned if category[1] in MONTHLY]
+        random_pick = [category for category in owned if category[1] not in MONTHLY]
+        weights = [profiles[name][0] for _, name in random_pick]
+
+        remaining = per_user
+        for month in months:
+            for category in recurring:
+                if remaining <= 0:
+                    break
+                remaining -= 1
+                yield build(user_id, category, month, 1)
+        while remaining > 0 and random_pick:
+            remaining -= 1
+            category = rng.choices(random_pick, weights=weights)[0]
+            yield build(user_id, category, rng.choice(months), rng.randint(1, 28))
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users with realistic categories, transactions and budgets "
+        "using bulk_create, for load testing and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--transactions", type=int, default=1000, help="Transactions per user.")
+        parser.add_argument("--months", type=int, default=24, help="Months of history per user.")
+        parser.add_argument("--prefix", default="loadtest", help="Username prefix for generated users.")
+        parser.add_argument("--password", default="password", help="Password set on every generated user.")
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, for repeatable datasets.")
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Parallel insert processes. Use 4+ on PostgreSQL for 1M+ rows; keep 1 on SQLite.",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rng = random.Random(options["seed"])
+        months = self.month_starts(options["months"])
+
+        users = self.create_users(options["users"], options["prefix"], options["password"])
+        categories = self.create_categories(users, rng)
+        budgets = self.create_budgets(users, months, rng)
+
+        workers = max(1, min(options["workers"], len(users)))
+        owned = [(category.user_id, category.pk, category.name) for category in categories]
+        jobs = [
+            (
+                [user.pk for user in users[index::workers]],
+                owned, months, options["transactions"], options["seed"] + index,
+            )
+            for index in range(workers)
+        ]
+        if workers == 1:
+            created = insert_transactions(*jobs[0])
+        else:
+            # Forked workers must not share the parent's database connection.
+            connections.close_all()
+            with multiprocessing.get_context("fork").Pool(workers) as pool:
+                created = sum(pool.starmap(insert_transactions, jobs))
+
+        # bulk_create bypasses Transaction.save, so refresh the stats rollup.
+        for user in users:
+            rollups.rebuild(user=user)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(users)} users, {len(categories)} categories, {budgets} budgets and "
+            f"{created} transactions in {elapsed:.1f}s ({created / elapsed:,.0f} rows/s)."
+        ))
+
+    def month_starts(self, count):
+        first = timezone.localdate().replace(day=1)
+        months = [first]
+        for _ in range(count - 1):
+            months.append((months[-1] - timedelta(days=1)).replace(day=1))
+        return months[::-1]
+
+    def create_users(self, count, prefix, password):
+        start = User.objects.filter(username__startswith=f"{prefix}-").count()
+        hashed = make_password(password)  # hash once, not once per user
+        users = [
+            User(username=f"{prefix}-{index}@example.com", email=f"{prefix}-{index}@example.com",
+                 first_name="Load", last_name=f"Test {index}", password=hashed)
+            for index in range(start, start + count)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=BATCH_SIZE)
+        # Not every backend returns primary keys from bulk_create.
+        return list(User.objects.filter(username__in=[user.username for user in users]).order_by("pk"))
+
+    def create_categories(self, users, rng):
+        categories = []
+        for user in users:
+            optional = [profile for profile in CATEGORY_PROFILES if profile[0] not in MONTHLY]
+            chosen = [profile for profile in CATEGORY_PROFILES if profile[0] in MONTHLY]
+            chosen += rng.sample(optional, k=rng.randint(len(optional) // 2, len(optional)))
+            categories.extend(Category(user=user, name=name, type=kind) for name, kind, _, _ in chosen)
+        Category.objects.bulk_create(categories, batch_size=BATCH_SIZE)
+        if categories and categories[0].pk is None:
+            categories = list(Category.objects.filter(user__in=users))
+        return categories
+
+    def create_budgets(self, users, months, rng):
+        budgets = [
+            MonthlyBudget(user=user, month=month, amount=Decimal(rng.randrange(1800, 3200, 50)))
+            for user in users
+            for month in months
+        ]
+        MonthlyBudget.objects.bulk_create(budgets, batch_size=BATCH_SIZE)
+        return len(budgets)
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from tracker import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the transaction table's monthly partitions for this month and --ahead months on, and with "
+        "--retain detach (or with --drop, drop) partitions older than that many months. PostgreSQL only; "
+        "see tracker.partitions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ahead", type=int, default=partitions.PARTITIONS_AHEAD,
+                            help="Months of partitions to keep ready after the current one.")
+        parser.add_argument("--retain", type=int, help="Detach partitions more than this many months old.")
+        parser.add_argument("--drop", action="store_true", help="Drop detached partitions instead of keeping them.")
+        parser.add_argument("--backfill", action="store_true",
+                            help="Move every month still in the default partition into its own partition.")
+        parser.add_argument("--convert", action="store_true",
+                            help="Partition the table first if it is not partitioned yet.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        if options["ahead"] < 0 or (options["retain"] is not None and options["retain"] < 0):
+            raise CommandError("--ahead and --retain cannot be negative.")
+        if options["drop"] and options["retain"] is None:
+            raise CommandError("--drop needs --retain.")
+        connection = connections[options["database"]]
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning needs PostgreSQL.")
+
+        if not partitions.is_partitioned(connection):
+            if not options["convert"]:
+                raise CommandError(
+                    "The transaction table is not partitioned. Set TRACKER_PARTITION_TRANSACTIONS before "
+                    "migrating, or pass --convert."
+                )
+            partitions.convert(connection)
+            self.stdout.write("Partitioned the transaction table.")
+
+        created, removed = partitions.ensure_partitions(
+            connection, ahead=options["ahead"], retain=options["retain"], drop=options["drop"],
+            backfill=options["backfill"],
+        )
+        verb = "Dropped" if options["drop"] else "Detached"
+        months = lambda values: ", ".join(f"{month:%Y-%m}" for month in values) or "none"
+        self.stdout.write(self.style.SUCCESS(f"Created partitions: {months(created)}. {verb}: {months(removed)}."))
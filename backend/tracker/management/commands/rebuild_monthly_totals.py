@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker import rollups
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user monthly category totals used by /api/stats/ from raw transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Only rebuild totals for this user id.")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"] is not None:
+            try:
+                user = User.objects.get(pk=options["user"])
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['user']} does not exist.")
+
+        created = rollups.rebuild(user=user)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {created} monthly total rows."))
@@ -0,0 +1,71 @@
+# Generated by Django 5.2 on 2026-10-17 16:06
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+
+def populate_monthly_totals(apps, schema_editor):
+    Transaction = apps.get_model('tracker', 'Transaction')
+    MonthlyCategoryTotal = apps.get_model('tracker', 'MonthlyCategoryTotal')
+    db_alias = schema_editor.connection.alias
+
+    grouped = (
+        Transaction.objects.using(db_alias)
+        .filter(is_active=True)
+        .annotate(month=TruncMonth('created_at', output_field=DateField(), tzinfo=timezone.get_default_timezone()))
+        .values('user_id', 'category_id', 'month')
+        .annotate(total=Sum('amount'), transaction_count=Count('id'))
+        .order_by()
+    )
+    MonthlyCategoryTotal.objects.using(db_alias).bulk_create(
+        [MonthlyCategoryTotal(**row) for row in grouped],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyCategoryTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='tracker.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user'], name='category_user_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(models.F('user'), django.db.models.functions.text.Lower('name'), name='category_user_lower_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='monthlybudget',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-month'], name='budget_user_active_month_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='monthlycategorytotal',
+            unique_together={('user', 'month', 'category')},
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at', '-id'], name='txn_user_active_created_idx'),
+        ),
+        migrations.RunPython(populate_monthly_totals, migrations.RunPython.noop),
+    ]
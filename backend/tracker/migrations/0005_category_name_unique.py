@@ -0,0 +1,51 @@
+# Generated by Django 5.2 on 2026-10-17 17:32
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def rename_duplicate_categories(apps, schema_editor):
+    # The old check-then-insert validation could let concurrent requests through.
+    # Keep the oldest of each active (user, name) group and number the rest, so
+    # their transactions keep pointing at them.
+    Category = apps.get_model('tracker', 'Category')
+    db_alias = schema_editor.connection.alias
+    active = Category.objects.using(db_alias).filter(is_active=True)
+
+    taken = {}
+    for pk, user_id, name_lower in active.order_by('created_at', 'pk').values_list('pk', 'user_id', Lower('name')):
+        taken.setdefault(user_id, {}).setdefault(name_lower, []).append(pk)
+    for user_id, names in taken.items():
+        for name_lower, pks in list(names.items()):
+            for duplicate in Category.objects.using(db_alias).filter(pk__in=pks[1:]):
+                suffix = 1
+                candidate = duplicate.name
+                while candidate.lower() in names:
+                    suffix += 1
+                    label = f' ({suffix})'
+                    candidate = duplicate.name[:100 - len(label)] + label
+                duplicate.name = candidate
+                names[candidate.lower()] = [duplicate.pk]
+                duplicate.save(update_fields=['name', 'updated_at'])  # so sync clients see the rename
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_updated_at_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_duplicate_categories, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='category',
+            name='category_user_lower_name_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='category',
+            constraint=models.UniqueConstraint(models.F('user'), django.db.models.functions.text.Lower('name'), condition=models.Q(('is_active', True)), name='category_user_lower_name_uniq'),
+        ),
+    ]
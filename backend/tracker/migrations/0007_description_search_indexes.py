@@ -0,0 +1,48 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import F, Q
+from django.db.models.functions import Upper
+
+# PostgreSQL only, so they live outside Transaction.Meta. The expressions must
+# match tracker.search exactly for the planner to use the indexes.
+SEARCH_INDEXES = [
+    GinIndex(
+        F('user'), SearchVector('description', config='simple'),
+        condition=Q(is_active=True), name='txn_description_search_idx',
+    ),
+    GinIndex(
+        F('user'), OpClass(Upper('description'), name='gin_trgm_ops'),
+        condition=Q(is_active=True), name='txn_description_trgm_idx',
+    ),
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    # pg_trgm for trigram matching; btree_gin so the indexes can lead with user_id.
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    Transaction = apps.get_model('tracker', 'Transaction')
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Transaction, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Transaction = apps.get_model('tracker', 'Transaction')
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Transaction, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_archive_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
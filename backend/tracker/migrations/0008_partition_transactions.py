@@ -0,0 +1,27 @@
+from django.db import migrations
+
+from tracker import partitions
+
+
+def partition_transactions(apps, schema_editor):
+    # Opt-in (TRACKER_PARTITION_TRANSACTIONS) and PostgreSQL only; see
+    # tracker.partitions. Deployments that opt in later run
+    # ``manage_partitions --convert`` instead.
+    connection = schema_editor.connection
+    if not partitions.enabled(connection):
+        return
+    partitions.convert(connection)
+    partitions.ensure_partitions(connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_description_search_indexes'),
+    ]
+
+    operations = [
+        # Going back to a plain table means copying every row; that is left
+        # to a manual, planned operation.
+        migrations.RunPython(partition_transactions, migrations.RunPython.noop),
+    ]
@@ -1,20 +1,36 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.db.models import F, Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 
+class ActiveManager(models.Manager):
+    """Rows that have not been soft-deleted."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
 class TimeStampedSoftDeleteModel(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+    # default rather than auto_now_add so that imports can keep historical dates
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    # ``objects`` hides soft-deleted rows; sync tombstones, archival and
+    # uniqueness checks that span deleted rows use ``all_with_deleted``.
+    # Related-object access (``txn.category``) still reaches deleted rows.
+    objects = ActiveManager()
+    all_with_deleted = models.Manager()
+
     class Meta:
         abstract = True
 
     def delete(self, using=None, keep_parents=False):
         self.is_active = False
         self.deleted_at = timezone.now()
-        self.save()
+        self.save(using=using, update_fields=['is_active', 'deleted_at', 'updated_at'])
 
 class Category(TimeStampedSoftDeleteModel):
     CATEGORY_TYPES = (
@@ -25,6 +41,19 @@ class Category(TimeStampedSoftDeleteModel):
     type = models.CharField(max_length=7, choices=CATEGORY_TYPES)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user'], condition=Q(is_active=True), name='category_user_active_idx'),
+            models.Index(fields=['user', 'updated_at'], name='category_user_updated_idx'),
+        ]
+        constraints = [
+            # Names are unique per user, ignoring case, among active categories.
+            # utils.exception_handler turns a violation into a validation error.
+            models.UniqueConstraint(
+                F('user'), Lower('name'), condition=Q(is_active=True), name='category_user_lower_name_uniq',
+            ),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -35,8 +64,36 @@ class Transaction(TimeStampedSoftDeleteModel):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField(blank=True)
 
+    class Meta:
+        indexes = [
+            # Listing, keyset pagination and date-range filters for one user.
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                condition=Q(is_active=True),
+                name='txn_user_active_created_idx',
+            ),
+            # Delta sync and conditional GET validators.
+            models.Index(fields=['user', 'updated_at'], name='txn_user_updated_idx'),
+        ]
+
     def __str__(self):
-        return f'{self.category.name} - {self.amount}'
+        # Only use the category name when it was fetched with the row, so that
+        # printing or logging a transaction never issues a query.
+        if Transaction.category.is_cached(self):
+            return f'{self.category.name} - {self.amount}'
+        return f'Category #{self.category_id} - {self.amount}'
+
+    def save(self, *args, **kwargs):
+        from . import rollups
+
+        using = kwargs.get('using')
+        with transaction.atomic(using=using):
+            # Lock the stored row and take what it contributed to the monthly
+            # rollup from it, not from when this instance was loaded: a
+            # concurrent save or delete may have changed it since.
+            previous = None if self._state.adding else rollups.stored_contribution(self.pk, using=using)
+            super().save(*args, **kwargs)
+            rollups.apply_change(previous, rollups.contribution(self))
 
 
 class MonthlyBudget(TimeStampedSoftDeleteModel):
@@ -46,3 +103,60 @@ class MonthlyBudget(TimeStampedSoftDeleteModel):
 
     class Meta:
         unique_together = ['user', 'month']
+        indexes = [
+            models.Index(fields=['user', '-month'], condition=Q(is_active=True), name='budget_user_active_month_idx'),
+            models.Index(fields=['user', 'updated_at'], name='budget_user_updated_idx'),
+        ]
+
+
+class MonthlyCategoryTotal(models.Model):
+    """Pre-summed active transactions per user, month and category.
+
+    Maintained incrementally by ``Transaction.save`` and rebuilt from scratch
+    with the ``rebuild_monthly_totals`` management command.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE)
+    month = models.DateField()
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ['user', 'month', 'category']
+
+    def __str__(self):
+        return f'{self.month:%Y-%m} {self.category_id} - {self.total}'
+
+
+class ArchivedRow(models.Model):
+    """
+    A soft-deleted row moved out of its live table by ``archive_deleted``.
+
+    Archive tables keep the live row's id and columns but have no foreign
+    keys to other tracker tables, so archiving never touches live rows.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        abstract = True
+
+
+class ArchivedCategory(ArchivedRow):
+    name = models.CharField(max_length=100)
+    type = models.CharField(max_length=7)
+
+
+class ArchivedTransaction(ArchivedRow):
+    category_id = models.BigIntegerField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    description = models.TextField(blank=True)
+
+
+class ArchivedMonthlyBudget(ArchivedRow):
+    month = models.DateField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
@@ -0,0 +1,176 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+from django.core.paginator import InvalidPage
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Largest value of a bigint primary key.
+MAX_ID = 2 ** 63 - 1
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on ``(created_at, id)``, newest first, or oldest
+    first with ``?ordering=created_at``.
+
+    Each page is a single indexed range query with ``LIMIT page_size + 1``:
+    there is no ``COUNT(*)`` and no ``OFFSET``, so deep pages cost the same as
+    the first one. Clients opt in per request with ``?pagination=cursor`` and
+    then follow the ``next`` / ``previous`` links, which carry the cursor.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    orderings = ('-created_at', 'created_at')
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return params.get(cls.mode_query_param) == 'cursor' or cls.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        window, reverse, position = self.page_window(queryset, request)
+        return self.set_page(list(window), reverse, position)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        window, reverse, position = self.page_window(queryset, request)
+        return self.set_page([row async for row in window], reverse, position)
+
+    def page_window(self, queryset, request):
+        """Return the unevaluated ``LIMIT page_size + 1`` query for this request's page."""
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), 'page')
+        self.page_size = self.get_page_size(request)
+
+        position = self.decode_cursor(request)
+        reverse = position is not None and position['reverse']
+        # Walking back (``previous``) scans against the requested order.
+        ascending = (self.get_ordering(request) == 'created_at') != reverse
+        if position is not None:
+            created_at, pk = position['created_at'], position['id']
+            # The plain created_at bound is implied by the OR, but lets the
+            # planner skip partitions (see ``partitions``) on the far side.
+            if ascending:
+                queryset = queryset.filter(
+                    Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk), created_at__gte=created_at
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk), created_at__lte=created_at
+                )
+
+        ordering = ('created_at', 'id') if ascending else ('-created_at', '-id')
+        return queryset.order_by(*ordering)[:self.page_size + 1], reverse, position
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param, self.orderings[0])
+        if ordering not in self.orderings:
+            raise ValidationError({self.ordering_query_param: [f'Choose one of: {", ".join(self.orderings)}.']})
+        return ordering
+
+    def set_page(self, results, reverse, position):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not reverse else True
+        self.has_previous = position is not None and (has_more if reverse else True)
+        return results
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            created_at = datetime.fromisoformat(payload['c'])
+            pk = int(payload['i'])
+        except (TypeError, ValueError, KeyError):
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        # Cursors are handed out with an aware timestamp and a real id; anything
+        # else was edited, and an out-of-range id would fail in the database.
+        if timezone.is_naive(created_at) or not 0 <= pk <= MAX_ID:
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return {'created_at': created_at, 'id': pk, 'reverse': bool(payload.get('r'))}
+
+    def encode_cursor(self, instance, reverse):
+        # ``id`` rather than ``pk``: pages can be model instances or named ``values_list`` rows.
+        payload = {'c': instance.created_at.isoformat(), 'i': instance.id}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+
+class AsyncPageNumberPagination(PageNumberPagination):
+    """``PageNumberPagination`` with an ``apaginate_queryset`` for async views."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a cached_property; fill it in so that page()
+        # does not run the COUNT(*) synchronously.
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(page_number=page_number, message=str(exc))
+            raise NotFound(msg)
+
+        self.page.object_list = [row async for row in self.page.object_list]
+        self.request = request
+        return list(self.page)
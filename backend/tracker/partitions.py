@@ -0,0 +1,217 @@
+"""
+Optional monthly range partitioning of the transaction table (PostgreSQL).
+
+With ``TRACKER_PARTITION_TRANSACTIONS`` on, migration 0008 turns
+``tracker_transaction`` into a table partitioned by ``RANGE (created_at)``:
+
+- the existing table becomes its ``DEFAULT`` partition, so converting is
+  renames and catalog changes plus one index build, not a copy;
+- the new parent gets the old table's indexes and foreign keys under their
+  original names. Its primary key becomes ``(id, created_at)``, because a
+  partitioned table's unique keys must include the partition key. ``id`` still
+  comes from a sequence and stays unique; nothing references it by foreign key;
+- partitions for this month and the next few are created right away.
+
+Partitions cover one calendar month in the project's ``TIME_ZONE``, the
+same boundaries ``dates.month_bounds`` gives month filters, so a month or
+date-range filter on ``created_at`` only touches the matching partitions.
+Creating a partition moves the default partition's rows for that month into
+it, so rows imported with old dates land in the default partition and are
+split out with ``manage_partitions --backfill``.
+
+``manage_partitions`` (run it from cron, e.g. daily) creates partitions
+ahead of time and, with ``--retain``, detaches (or drops) old ones. Detaching
+a month also deletes its ``MonthlyCategoryTotal`` rows in the same
+transaction, so the rollups keep matching the table.
+"""
+import re
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from . import caching
+from .dates import month_bounds
+from .models import MonthlyCategoryTotal
+
+TABLE = 'tracker_transaction'
+DEFAULT_PARTITION = f'{TABLE}_default'
+SEQUENCE = f'{TABLE}_id_seq'
+PARTITION_PATTERN = re.compile(rf'^{TABLE}_p(\d{{4}})_(\d{{2}})$')
+PARTITIONS_AHEAD = 3
+
+
+def enabled(connection):
+    return connection.vendor == 'postgresql' and getattr(settings, 'TRACKER_PARTITION_TRANSACTIONS', False)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y_%m}'
+
+
+def partition_bounds(month):
+    return month_bounds(month, tz=ZoneInfo(settings.TIME_ZONE))
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _literal(value):
+    # Partition bounds are DDL, which takes no query parameters.
+    return "'%s'" % value.isoformat()
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = current_schema()::regnamespace",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partitions(connection):
+    """First-of-month dates of the attached monthly partitions, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace",
+            [TABLE],
+        )
+        names = [name for name, in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            months.append(date(int(match[1]), int(match[2]), 1))
+    return sorted(months)
+
+
+def convert(connection):
+    """Turn the plain transaction table into a partitioned one. Returns False if it already is."""
+    if is_partitioned(connection):
+        return False
+    qn = connection.ops.quote_name
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute("SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'", [TABLE])
+        primary_key = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [TABLE],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+            [TABLE],
+        )
+        indexes = [(name, definition) for name, definition in cursor.fetchall() if name != primary_key]
+        cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {qn(TABLE)}')
+        next_id = cursor.fetchone()[0]
+
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} RENAME TO {qn(DEFAULT_PARTITION)}')
+        cursor.execute(f'ALTER TABLE {qn(DEFAULT_PARTITION)} DROP CONSTRAINT {qn(primary_key)}')
+        # A partitioned parent cannot have an identity column before
+        # PostgreSQL 17, so ids come from a plain sequence owned by the parent.
+        cursor.execute(f'ALTER TABLE {qn(DEFAULT_PARTITION)} ALTER COLUMN id DROP IDENTITY IF EXISTS')
+        cursor.execute(f'ALTER TABLE {qn(DEFAULT_PARTITION)} ALTER COLUMN id DROP DEFAULT')
+        cursor.execute(f'DROP SEQUENCE IF EXISTS {qn(SEQUENCE)}')
+        for name, _ in indexes:
+            cursor.execute(f'ALTER INDEX {qn(name)} RENAME TO {qn(name[:54] + "_default")}')
+
+        cursor.execute(
+            f'CREATE TABLE {qn(TABLE)} (LIKE {qn(DEFAULT_PARTITION)} INCLUDING DEFAULTS) PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'CREATE SEQUENCE {qn(SEQUENCE)} OWNED BY {qn(TABLE)}.id START WITH {int(next_id)}')
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')")
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(primary_key)} PRIMARY KEY (id, created_at)')
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(name)} {definition}')
+        # The definitions still name the parent, which now is the new table;
+        # attaching the partition adopts its matching (renamed) indexes.
+        for _, definition in indexes:
+            cursor.execute(definition)
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(DEFAULT_PARTITION)} DEFAULT')
+    return True
+
+
+def create_partition(connection, month):
+    """Create and attach ``month``'s partition, moving its rows out of the default partition."""
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    start, end = partition_bounds(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS)')
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} WHERE created_at >= %s AND created_at < %s '
+            f'RETURNING *) INSERT INTO {qn(name)} SELECT * FROM moved',
+            [start, end],
+        )
+        cursor.execute(
+            f'ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} '
+            f'FOR VALUES FROM ({_literal(start)}) TO ({_literal(end)})'
+        )
+
+
+def forget_month(connection, month):
+    """Delete ``month``'s rollups and cached stats, for when its rows leave the table."""
+    totals = MonthlyCategoryTotal.objects.using(connection.alias).filter(month=month)
+    user_ids = set(totals.values_list('user_id', flat=True))
+    totals.delete()
+    for user_id in user_ids:
+        caching.invalidate_stats(user_id, [month])
+
+
+def detach_partition(connection, month, drop=False):
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}')
+        if drop:
+            cursor.execute(f'DROP TABLE {qn(name)}')
+        forget_month(connection, month)
+
+
+def default_partition_months(connection):
+    """Months that still have rows in the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT DISTINCT (date_trunc(%s, created_at AT TIME ZONE %s))::date '
+            f'FROM {connection.ops.quote_name(DEFAULT_PARTITION)}',
+            ['month', settings.TIME_ZONE],
+        )
+        return sorted(month for month, in cursor.fetchall())
+
+
+def ensure_partitions(connection, ahead=PARTITIONS_AHEAD, retain=None, drop=False, backfill=False):
+    """
+    Create partitions from this month to ``ahead`` months on, plus (with
+    ``backfill``) one per month still in the default partition. With
+    ``retain``, detach (or ``drop``) partitions for months more than
+    ``retain`` months before this one. Returns ``(created, removed)`` months.
+    """
+    existing = set(monthly_partitions(connection))
+    current = timezone.localdate().replace(day=1)
+    wanted = {add_months(current, step) for step in range(ahead + 1)}
+    if backfill:
+        wanted.update(default_partition_months(connection))
+    cutoff = add_months(current, -retain) if retain is not None else None
+
+    created = []
+    for month in sorted(wanted - existing):
+        if cutoff is None or month >= cutoff:
+            create_partition(connection, month)
+            created.append(month)
+    removed = []
+    if cutoff is not None:
+        for month in sorted(existing):
+            if month < cutoff:
+                detach_partition(connection, month, drop=drop)
+                removed.append(month)
+    return created, removed
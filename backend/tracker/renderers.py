@@ -0,0 +1,41 @@
+"""
+JSON rendering with orjson (``pip install orjson``) when it is installed.
+
+``ORJSONRenderer`` is a drop-in ``JSONRenderer``: same media type and the
+same output for the types DRF's encoder handles (``Decimal`` as a number,
+UTC datetimes with ``Z``, dates, UUIDs, lazy strings, non-string keys).
+Without orjson, or when a client asks for indented output, it renders with
+DRF's stdlib-based encoder.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_encoder = JSONEncoder()
+
+if orjson is not None:
+    # Dates, datetimes and UUIDs are native; UTC as "Z" matches DRF's encoder.
+    ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj):
+    """Types orjson does not know (``Decimal``, lazy strings, ...), as DRF encodes them."""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+        # Like JSONRenderer: escape U+2028/U+2029 so the output is valid JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,117 @@
+from collections import defaultdict
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyCategoryTotal, Transaction
+
+
+def month_of(value):
+    """First day of the month ``value`` falls in, in the project timezone."""
+    return timezone.localtime(value, timezone.get_default_timezone()).date().replace(day=1)
+
+
+def contribution(txn):
+    """Return ``((user_id, category_id, month), amount)`` or None for inactive rows."""
+    if not txn.is_active or txn.created_at is None:
+        return None
+    return (txn.user_id, txn.category_id, month_of(txn.created_at)), txn.amount
+
+
+def stored_contribution(pk, using=None):
+    """The stored row's contribution, locking the row until the transaction ends."""
+    row = (
+        Transaction.all_with_deleted.using(using)
+        .select_for_update()
+        .filter(pk=pk)
+        .values("user_id", "category_id", "created_at", "amount", "is_active")
+        .first()
+    )
+    if row is None or not row["is_active"]:
+        return None
+    return (row["user_id"], row["category_id"], month_of(row["created_at"])), row["amount"]
+
+
+def apply_delta(key, amount, count):
+    user_id, category_id, month = key
+    rows = MonthlyCategoryTotal.objects.filter(user_id=user_id, category_id=category_id, month=month)
+    changes = {"total": F("total") + amount, "transaction_count": F("transaction_count") + count}
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            MonthlyCategoryTotal.objects.create(
+                user_id=user_id, category_id=category_id, month=month,
+                total=amount, transaction_count=count,
+            )
+    except IntegrityError:
+        # Another writer created the row between our UPDATE and INSERT.
+        rows.update(**changes)
+
+
+def apply_change(previous, current):
+    """Move a transaction's contribution from ``previous`` to ``current``."""
+    if previous == current:
+        return
+    if previous is not None and current is not None and previous[0] == current[0]:
+        apply_delta(current[0], current[1] - previous[1], 0)
+        return
+    if previous is not None:
+        apply_delta(previous[0], -previous[1], -1)
+    if current is not None:
+        apply_delta(current[0], current[1], 1)
+
+
+def batch_deltas(rows, category_id=None):
+    """
+    Rollup deltas for soft-deleting ``rows`` of ``(user_id, category_id,
+    created_at, amount)``, or for moving them to ``category_id``. Returns
+    ``{key: [amount, count]}`` with one entry per touched (month, category).
+    """
+    deltas = defaultdict(lambda: [0, 0])
+    for user_id, old_category_id, created_at, amount in rows:
+        if old_category_id == category_id:
+            continue
+        month = month_of(created_at)
+        removed = deltas[(user_id, old_category_id, month)]
+        removed[0] -= amount
+        removed[1] -= 1
+        if category_id is not None:
+            added = deltas[(user_id, category_id, month)]
+            added[0] += amount
+            added[1] += 1
+    return deltas
+
+
+def rebuild(user=None):
+    """Recompute every rollup row (optionally for one user) from raw transactions."""
+    transactions = Transaction.objects.all()
+    totals = MonthlyCategoryTotal.objects.all()
+    if user is not None:
+        transactions = transactions.filter(user=user)
+        totals = totals.filter(user=user)
+
+    grouped = (
+        transactions.annotate(
+            month=TruncMonth(
+                "created_at",
+                output_field=DateField(),
+                tzinfo=timezone.get_default_timezone(),
+            )
+        )
+        .values("user_id", "category_id", "month")
+        .annotate(total=Sum("amount"), transaction_count=Count("id"))
+        .order_by()
+    )
+
+    created = 0
+    with transaction.atomic():
+        totals.delete()
+        rows = (MonthlyCategoryTotal(**row) for row in grouped.iterator(chunk_size=2000))
+        while batch := list(islice(rows, 2000)):
+            MonthlyCategoryTotal.objects.bulk_create(batch)
+            created += len(batch)
+    return created
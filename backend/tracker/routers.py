@@ -0,0 +1,85 @@
+"""
+Read-replica routing for the GET-only stats and list endpoints.
+
+Views opt in with ``ReplicaReadMixin`` (or ``replica_reads`` on the async
+views); inside such a request ``ReadReplicaRouter`` sends every read to
+the ``TRACKER_READ_REPLICA`` alias, and writes still go to the primary. The
+flag lives in a context variable, so it follows the request into
+``sync_to_async`` threads and never leaks into other requests.
+
+Replicas lag. After a write, the user's reads stay on the primary for
+``TRACKER_REPLICA_LAG`` seconds, so they see their own changes and the
+response cache is never refilled from data older than the write.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+_replica_reads = ContextVar('tracker_replica_reads', default=False)
+
+
+def replica_alias():
+    return getattr(settings, 'TRACKER_READ_REPLICA', None)
+
+
+class ReadReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if _replica_reads.get():
+            return replica_alias()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
+
+
+def _pin_key(user_id):
+    return f'tracker:primary:{user_id}'
+
+
+def pin_to_primary(user_id):
+    if replica_alias():
+        cache.set(_pin_key(user_id), True, getattr(settings, 'TRACKER_REPLICA_LAG', 5))
+
+
+def use_replica(request):
+    """Whether ``request``, authenticated already, may read from the replica."""
+    return bool(
+        replica_alias()
+        and request.method in SAFE_METHODS
+        and not cache.get(_pin_key(request.user.pk))
+    )
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe requests from the read replica, for ``replica_actions`` only
+    on viewsets. Authentication still reads from the primary.
+    """
+    replica_actions = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        action = getattr(self, 'action', None)
+        if (self.replica_actions is None or action in self.replica_actions) and use_replica(request):
+            self._replica_token = _replica_reads.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _replica_reads.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,65 @@
+"""
+``?search=`` over transaction descriptions, served from indexes on PostgreSQL.
+
+DRF's ``SearchFilter`` turns each term into ``UPPER(description) LIKE
+'%TERM%'``, which no B-tree index can answer, so every search scanned all of
+the user's rows. On PostgreSQL ``TransactionSearchFilter`` matches a row when
+any of these holds:
+
+- full-text: ``websearch_to_tsquery`` against the description's ``tsvector``
+  (words, "quoted phrases", ``-excluded`` words, ``or``);
+- substring: the whole term anywhere in the description;
+- fuzzy: ``pg_trgm`` word similarity, so typos still match.
+
+Each test has a GIN index that leads with ``user_id`` (migration 0007), so
+the work depends on how many rows match, not on how long the user's history
+is. Results are ordered by relevance (text rank plus
+trigram similarity), then newest first. Keyset pagination keeps its own
+newest-first order.
+
+Other databases (SQLite for local work and tests) fall back to DRF's
+``SearchFilter``.
+"""
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, Q, Value
+from django.db.models.functions import Upper
+from rest_framework.filters import SearchFilter
+
+# No stemming: descriptions are short and not all English; trigrams cover
+# near misses instead.
+SEARCH_CONFIG = 'simple'
+MAX_TERM_LENGTH = 200
+
+
+def description_vector():
+    # Must stay identical to the expression indexed by migration 0007.
+    return SearchVector('description', config=SEARCH_CONFIG)
+
+
+def search_transactions(queryset, term):
+    """Transactions in ``queryset`` matching ``term``, most relevant first. PostgreSQL only."""
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    upper_term = Upper(Value(term))
+    return (
+        queryset.alias(document=description_vector(), upper_description=Upper('description'))
+        .filter(
+            Q(document=query)
+            | Q(upper_description__contains=term.upper())
+            | Q(TrigramWordSimilar(F('upper_description'), upper_term))
+        )
+        .annotate(
+            rank=SearchRank(F('document'), query) + TrigramWordSimilarity(upper_term, F('upper_description'))
+        )
+        .order_by('-rank', '-created_at', '-id')
+    )
+
+
+class TransactionSearchFilter(SearchFilter):
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()[:MAX_TERM_LENGTH]
+        if not term or connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+        return search_transactions(queryset, term)
@@ -9,23 +9,8 @@ class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
-        
-    def validate(self, attrs):
-        user = self.context['request'].user
-        name = attrs.get('name', '').strip().lower()
-
-        # Exclude current instance when updating
-        qs = Category.objects.filter(
-            user=user,
-            name__iexact=name
-        )
-        if self.instance:
-            qs = qs.exclude(pk=self.instance.pk)
-
-        if qs.exists():
-            raise serializers.ValidationError({'name': 'Category with this name already exists for this user.'})
-
-        return attrs    
+        # Names are unique per user through the category_user_lower_name_uniq
+        # constraint; the insert or update itself reports a duplicate.
 
 class TransactionSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
@@ -37,6 +22,23 @@ class TransactionSerializer(serializers.ModelSerializer):
         model = Transaction
         fields = '__all__'
         
+
+class TransactionBatchChangesSerializer(serializers.Serializer):
+    """Fields a batch update may set on every selected transaction."""
+    category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.none(), required=False)
+    description = serializers.CharField(allow_blank=True, required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        user = self.context['request'].user
+        self.fields['category'].queryset = Category.objects.filter(user=user)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError('Give a category or description to set.')
+        return attrs
+
+
 class MonthlyBudgetSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
     month = serializers.DateField(read_only=True)  # Only auto-set in create
@@ -59,7 +61,8 @@ class MonthlyBudgetSerializer(serializers.ModelSerializer):
 
         # If creating, ensure this user doesn't already have a budget for this month
         if self.instance is None:
-            exists = MonthlyBudget.objects.filter(user=user, month=today).exists()
+            # Deleted budgets still hold the (user, month) unique key.
+            exists = MonthlyBudget.all_with_deleted.filter(user=user, month=today).exists()
             if exists:
                 raise serializers.ValidationError("You already have a budget for this month.")
 
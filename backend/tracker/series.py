@@ -0,0 +1,144 @@
+"""
+Income and expense time series for the dashboard charts.
+
+Transactions are summed per day, ISO week (starting Monday) or month in
+the database with ``Trunc*`` in the current timezone, so the response size
+depends on the range and bucket, not on the number of transactions. Every
+bucket in the range gets a point, empty ones included. The first and last
+buckets are clipped to the requested dates.
+
+Each point also carries ``cumulative_expense``, the running expense since the
+start of the point's month, next to that month's ``MonthlyBudget`` amount. A
+week is counted in the month it starts in. When the range starts mid-month,
+one more query sums that month's expense before the range to seed the total.
+
+If there are more buckets than ``max_points``, consecutive buckets are merged
+in equal groups. Merged points sum income and expense and keep the last
+bucket's cumulative expense and budget, so totals are preserved.
+``buckets_per_point`` in the payload says how many buckets each point covers.
+"""
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db.models import DateField, F, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+
+from .dates import day_start, next_month
+from .models import Transaction
+from .stats import range_budgets
+
+BUCKETS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+DEFAULT_MAX_POINTS = 300
+MAX_POINTS = 1000
+# About ten years of daily buckets, like stats' MAX_RANGE_MONTHS.
+MAX_RANGE_DAYS = 3660
+
+
+def bucket_floor(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def bucket_next(day, bucket):
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    if bucket == 'month':
+        return next_month(day)
+    return day + timedelta(days=1)
+
+
+def bucket_totals(user, start, end, bucket):
+    """``(period, category type, total)`` rows for ``start`` to ``end`` inclusive."""
+    return (
+        Transaction.objects.filter(
+            user=user,
+            category__is_active=True,
+            created_at__gte=day_start(start),
+            created_at__lt=day_start(end + timedelta(days=1)),
+        )
+        .annotate(period=BUCKETS[bucket]('created_at', output_field=DateField()))
+        .values('period', category_type=F('category__type'))
+        .annotate(total=Sum('amount'))
+        .values_list('period', 'category_type', 'total')
+        .order_by()
+    )
+
+
+def expense_before(user, day):
+    """Expense from the first of ``day``'s month up to, not including, ``day``."""
+    if day.day == 1:
+        return 0
+    total = (
+        Transaction.objects.filter(
+            user=user,
+            category__is_active=True,
+            created_at__gte=day_start(day.replace(day=1)),
+            created_at__lt=day_start(day),
+        )
+        .exclude(category__type='income')
+        .aggregate(total=Sum('amount'))['total']
+    )
+    return total or 0
+
+
+def downsample(points, max_points):
+    size = math.ceil(len(points) / max_points)
+    if size <= 1:
+        return points, 1
+    merged = []
+    for index in range(0, len(points), size):
+        group = points[index:index + size]
+        merged.append({
+            **group[-1],
+            'start': group[0]['start'],
+            'income': sum(point['income'] for point in group),
+            'expense': sum(point['expense'] for point in group),
+        })
+    return merged, size
+
+
+def chart_series(user, start, end, bucket, max_points=DEFAULT_MAX_POINTS):
+    """Bucketed series for ``user`` from ``start`` to ``end`` (dates, inclusive)."""
+    totals = defaultdict(lambda: {'income': 0, 'expense': 0})
+    for period, category_type, total in bucket_totals(user, start, end, bucket):
+        totals[period]['income' if category_type == 'income' else 'expense'] += total
+    budgets = dict(range_budgets(user, start.replace(day=1), end.replace(day=1)))
+
+    points = []
+    month = start.replace(day=1)
+    cumulative = expense_before(user, start)
+    period = bucket_floor(start, bucket)
+    while period <= end:
+        following = bucket_next(period, bucket)
+        point_start = max(period, start)
+        if point_start.replace(day=1) != month:
+            month = point_start.replace(day=1)
+            cumulative = 0
+        income, expense = totals[period]['income'], totals[period]['expense']
+        cumulative += expense
+        points.append({
+            'start': point_start,
+            'end': min(following - timedelta(days=1), end),
+            'income': income,
+            'expense': expense,
+            'cumulative_expense': cumulative,
+            'budget': budgets.get(month, 0),
+        })
+        period = following
+
+    points, size = downsample(points, max_points)
+    return {
+        'from': start,
+        'to': end,
+        'bucket': bucket,
+        'buckets_per_point': size,
+        'points': points,
+    }
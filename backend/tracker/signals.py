@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from . import caching
+from .authentication import invalidate_user
+from .models import Category, MonthlyBudget, Transaction
+from .rollups import month_of
+
+
+@receiver(post_save, sender=Transaction)
+@receiver(post_delete, sender=Transaction)
+def transaction_changed(sender, instance, **kwargs):
+    caching.invalidate_stats(instance.user_id, [month_of(instance.created_at)])
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    caching.invalidate_categories(instance.user_id)
+
+
+@receiver(post_save, sender=MonthlyBudget)
+@receiver(post_delete, sender=MonthlyBudget)
+def budget_changed(sender, instance, **kwargs):
+    caching.invalidate_stats(instance.user_id, [instance.month])
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    invalidate_user(getattr(instance, api_settings.USER_ID_FIELD))
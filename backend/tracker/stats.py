@@ -0,0 +1,137 @@
+import asyncio
+from collections import defaultdict
+
+from django.db.models import F, Sum
+
+from .models import MonthlyBudget, MonthlyCategoryTotal
+
+# Upper bound on a range request, to keep the payload bounded.
+MAX_RANGE_MONTHS = 120
+
+
+def month_range(start, end):
+    """Every first-of-month date from ``start`` to ``end`` inclusive."""
+    months = []
+    current = start
+    while current <= end:
+        months.append(current)
+        current = current.replace(year=current.year + current.month // 12, month=current.month % 12 + 1)
+    return months
+
+
+def summarize(month, budget, totals):
+    """Build the stats payload for one month from ``(type, name, amount)`` rows."""
+    income_categories = []
+    expense_categories = []
+    total_income = 0
+    total_expense = 0
+
+    for category_type, category_name, amount in totals:
+        data = {
+            "category": category_name,
+            "amount": amount
+        }
+        if category_type == "income":
+            income_categories.append(data)
+            total_income += amount
+        else:
+            expense_categories.append(data)
+            total_expense += amount
+
+    return {
+        "month": month.strftime("%Y-%m"),
+        "budget": budget,
+        "total_income": total_income,
+        "total_expense": total_expense,
+        "income_categories": income_categories,
+        "expense_categories": expense_categories
+    }
+
+
+def category_totals(user, **month_filter):
+    # Pre-summed transactions per month, kept current by Transaction.save
+    return (
+        MonthlyCategoryTotal.objects.filter(
+            user=user,
+            transaction_count__gt=0,
+            category__is_active=True,  # Optional: if you soft-delete categories
+            **month_filter
+        )
+        .values("month", category_type=F("category__type"), category_name=F("category__name"))
+        .annotate(total_amount=Sum("total"))
+    )
+
+
+def month_budget(user, month):
+    return MonthlyBudget.objects.filter(user=user, month=month).values_list("amount", flat=True)
+
+
+def range_budgets(user, start, end):
+    return MonthlyBudget.objects.filter(user=user, month__range=(start, end)).values_list(
+        "month", "amount"
+    )
+
+
+def total_rows(totals):
+    return ((row["category_type"], row["category_name"], row["total_amount"]) for row in totals)
+
+
+def group_by_month(totals):
+    grouped = defaultdict(list)
+    for row in totals:
+        grouped[row["month"]].append((row["category_type"], row["category_name"], row["total_amount"]))
+    return grouped
+
+
+def range_payload(start, end, budgets, totals):
+    return {
+        "from": start.strftime("%Y-%m"),
+        "to": end.strftime("%Y-%m"),
+        "months": [summarize(month, budgets.get(month, 0), totals[month]) for month in month_range(start, end)],
+    }
+
+
+def monthly_stats(user, month):
+    """Budget, totals and per-category breakdown for ``user`` in ``month`` (first day)."""
+    budget = month_budget(user, month).first() or 0
+    return summarize(month, budget, total_rows(category_totals(user, month=month)))
+
+
+def range_stats(user, start, end):
+    """
+    Per-month stats for every month from ``start`` to ``end`` inclusive.
+
+    Always two queries, whatever the number of months: one month-grouped
+    aggregate over the rollup table and one budget lookup.
+    """
+    budgets = dict(range_budgets(user, start, end))
+    totals = group_by_month(category_totals(user, month__range=(start, end)).order_by("month"))
+    return range_payload(start, end, budgets, totals)
+
+
+async def alist(queryset):
+    # One hop to the database thread for the whole result, rather than one
+    # per chunk as with aiterator(), which values_list() does not support.
+    return [row async for row in queryset]
+
+
+# The async variants await their budget and totals queries with
+# asyncio.gather, but that does not make them concurrent: Django's async ORM
+# runs queries thread-sensitively on the request's one connection, so they
+# still execute back to back. What the async views gain is that the event
+# loop serves other requests while these run.
+
+async def amonthly_stats(user, month):
+    budget, totals = await asyncio.gather(
+        month_budget(user, month).afirst(),
+        alist(category_totals(user, month=month)),
+    )
+    return summarize(month, budget or 0, total_rows(totals))
+
+
+async def arange_stats(user, start, end):
+    budgets, totals = await asyncio.gather(
+        alist(range_budgets(user, start, end)),
+        alist(category_totals(user, month__range=(start, end)).order_by("month")),
+    )
+    return range_payload(start, end, dict(budgets), group_by_month(totals))
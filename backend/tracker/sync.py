@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import (
+    ArchivedCategory,
+    ArchivedMonthlyBudget,
+    ArchivedTransaction,
+    Category,
+    MonthlyBudget,
+    Transaction,
+)
+from .serializers import CategorySerializer, MonthlyBudgetSerializer, TransactionSerializer
+
+# Rows committed by a transaction that began before the watermark was taken
+# can carry an older updated_at. Handing back a watermark slightly in the past
+# means such rows are sent again on the next sync instead of being missed;
+# clients apply changes by id, so repeats are harmless.
+SYNC_OVERLAP = timedelta(seconds=5)
+
+COLLECTIONS = (
+    ('categories', Category, ArchivedCategory, CategorySerializer, ()),
+    ('transactions', Transaction, ArchivedTransaction, TransactionSerializer, ('category',)),
+    ('monthly_budgets', MonthlyBudget, ArchivedMonthlyBudget, MonthlyBudgetSerializer, ()),
+)
+
+
+def tombstone(instance):
+    return {'id': instance.pk, 'is_active': False, 'deleted_at': instance.deleted_at}
+
+
+def changes_since(user, since, context):
+    """
+    Every category, transaction and budget of ``user`` changed after ``since``.
+
+    Without ``since`` this is a full snapshot of active rows. Soft-deleted rows,
+    archived ones included, are returned as tombstones. The returned
+    ``watermark`` is what the client sends as ``since`` next time.
+    """
+    started_at = timezone.now()
+    payload = {}
+    for name, model, archive, serializer_class, related in COLLECTIONS:
+        queryset = model.all_with_deleted.filter(user=user).select_related(*related).order_by('updated_at', 'id')
+        if since is None:
+            queryset = queryset.filter(is_active=True)
+        else:
+            queryset = queryset.filter(updated_at__gt=since)
+        live, deleted = [], []
+        for instance in queryset:
+            (live if instance.is_active else deleted).append(instance)
+        if since is not None:
+            # Rows archived since the last sync may have been deleted before it;
+            # sending their tombstone again is harmless.
+            deleted += archive.objects.filter(user=user, archived_at__gt=since).only('id', 'deleted_at')
+        payload[name] = serializer_class(live, many=True, context=context).data + [tombstone(row) for row in deleted]
+
+    watermark = started_at - SYNC_OVERLAP
+    if since is not None:
+        watermark = max(watermark, since)
+    return {'watermark': watermark, 'full': since is None, **payload}
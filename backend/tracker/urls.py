@@ -7,6 +7,16 @@ from .views import (
     RegisterUserView,
     UserProfileView,
     MonthlyStatsAPIView,
+    CacheStatsView,
+    SyncAPIView,
+    DashboardAPIView,
+    ChartSeriesAPIView,
+)
+from .async_views import (
+    CategoryListAsyncView,
+    MonthlyStatsAsyncView,
+    TransactionListAsyncView,
+    UserProfileAsyncView,
 )
 
 router = DefaultRouter()
@@ -18,4 +28,13 @@ urlpatterns = router.urls + [
     path('register/', RegisterUserView.as_view(), name='register'),
     path('profile/', UserProfileView.as_view(), name='user-profile'),
     path("stats/", MonthlyStatsAPIView.as_view(), name="monthly-stats"),
+    path("stats/series/", ChartSeriesAPIView.as_view(), name="chart-series"),
+    path("sync/", SyncAPIView.as_view(), name="sync"),
+    path("dashboard/", DashboardAPIView.as_view(), name="dashboard"),
+    path("cache-stats/", CacheStatsView.as_view(), name="cache-stats"),
+    # Async versions of the read-heavy endpoints, for serving under ASGI.
+    path("async/stats/", MonthlyStatsAsyncView.as_view(), name="async-monthly-stats"),
+    path("async/profile/", UserProfileAsyncView.as_view(), name="async-user-profile"),
+    path("async/transactions/", TransactionListAsyncView.as_view(), name="async-transaction-list"),
+    path("async/categories/", CategoryListAsyncView.as_view(), name="async-category-list"),
 ]
@@ -6,6 +6,7 @@ from .serializers import (
     TransactionSerializer,
     MonthlyBudgetSerializer,
     RegisterSerializer,
+    TransactionBatchChangesSerializer,
     MonthlyStatsSerializer
 )
 from rest_framework.views import APIView
@@ -15,72 +16,191 @@ from .serializers import UserProfileSerializer
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.decorators import action
 from datetime import date
-from django.db.models import Sum, F
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter
 from .filters import TransactionFilter
+from .search import TransactionSearchFilter
+from .pagination import KeysetPagination
+from .listing import transaction_reader
+from .exports import EXPORTERS
+from .imports import import_transactions, read_rows
+from .batch import delete_transactions, select_transactions, update_transactions
+from .stats import MAX_RANGE_MONTHS, monthly_stats, range_stats
+from . import caching
+from .sync import changes_since
+from .dashboard import category_list_payload, dashboard_payload, parse_sections
+from .series import BUCKETS, DEFAULT_MAX_POINTS, MAX_POINTS, MAX_RANGE_DAYS, chart_series
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .conditional import ConditionalGetMixin, evaluate, user_validators
+from .instrumentation import InstrumentedViewMixin, serialize_timer
+from .routers import ReplicaReadMixin
+from rest_framework.parsers import MultiPartParser
+from .parsers import ORJSONParser
 from rest_framework.decorators import api_view
 
-class MonthlyStatsAPIView(APIView):
+def parse_month(value):
+    return date.fromisoformat(value + "-01")
+
+
+def stats_period(params):
+    """
+    Return ``(start, end)`` first-of-month dates for a stats request, with
+    ``end`` None in single-month mode. Raises ValueError with the message
+    for the client when the parameters are invalid.
+    """
+    if not any(name in params for name in ("from", "to", "year")):
+        query_month = params.get("month")
+        try:
+            return (parse_month(query_month) if query_month else date.today().replace(day=1)), None
+        except ValueError:
+            raise ValueError("Invalid month format. Use YYYY-MM.")
+
+    try:
+        if "year" in params:
+            start = date(int(params["year"]), 1, 1)
+            end = start.replace(month=12)
+        else:
+            start = parse_month(params["from"])
+            end = parse_month(params["to"]) if "to" in params else date.today().replace(day=1)
+    except (KeyError, ValueError):
+        raise ValueError("Invalid range. Use from=YYYY-MM&to=YYYY-MM or year=YYYY.")
+    months = (end.year - start.year) * 12 + end.month - start.month + 1
+    if not 1 <= months <= MAX_RANGE_MONTHS:
+        raise ValueError(f"Range must be 1 to {MAX_RANGE_MONTHS} months.")
+    return start, end
+
+
+class MonthlyStatsAPIView(ReplicaReadMixin, APIView):
+    """
+    Stats for one month (``?month=YYYY-MM``, default current month), or per
+    month over a range with ``?from=YYYY-MM&to=YYYY-MM`` or ``?year=YYYY``.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        try:
+            start, end = stats_period(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
         user = request.user
-        query_month = request.query_params.get("month")
+        # The period can default to today's month, so it is part of the ETag.
+        validators = user_validators(user.id, [Transaction, Category, MonthlyBudget]) + [start, end]
+        if end is not None:
+            return evaluate(request, validators, lambda: Response(range_stats(user, start, end)))
+
+        def respond():
+            data, hit = caching.get_or_compute(
+                'stats', caching.stats_key(user.id, start), lambda: monthly_stats(user, start)
+            )
+            response = Response(data)
+            response['X-Cache'] = 'HIT' if hit else 'MISS'
+            return response
+
+        return evaluate(request, validators, respond)
+
+
+def series_params(params):
+    """
+    Return ``(start, end, bucket, max_points)`` for a chart series request.
+    Raises ValueError with the message for the client when they are invalid.
+    """
+    try:
+        end = date.fromisoformat(params["date_to"]) if "date_to" in params else date.today()
+        start = date.fromisoformat(params["date_from"]) if "date_from" in params else end.replace(day=1)
+    except ValueError:
+        raise ValueError("Invalid date. Use date_from=YYYY-MM-DD&date_to=YYYY-MM-DD.")
+    if not 0 <= (end - start).days < MAX_RANGE_DAYS:
+        raise ValueError(f"date_from must be on or before date_to, at most {MAX_RANGE_DAYS} days apart.")
 
+    bucket = params.get("bucket", "day")
+    if bucket not in BUCKETS:
+        raise ValueError(f"Invalid bucket. Choose one of: {', '.join(BUCKETS)}.")
+    try:
+        max_points = int(params.get("max_points", DEFAULT_MAX_POINTS))
+    except ValueError:
+        max_points = 0
+    if not 2 <= max_points <= MAX_POINTS:
+        raise ValueError(f"max_points must be a number from 2 to {MAX_POINTS}.")
+    return start, end, bucket, max_points
+
+
+class ChartSeriesAPIView(ReplicaReadMixin, APIView):
+    """
+    Income, expense and cumulative spend against budget per day, week or
+    month: ``?date_from=YYYY-MM-DD&date_to=YYYY-MM-DD&bucket=day|week|month``,
+    with at most ``?max_points=`` points (default 300). Defaults to the
+    current month by day.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            start, end, bucket, max_points = series_params(request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+        user = request.user
+        validators = user_validators(user.id, [Transaction, Category, MonthlyBudget]) + [start, end]
+        return evaluate(
+            request, validators, lambda: Response(chart_series(user, start, end, bucket, max_points))
+        )
+
+
+class DashboardAPIView(ReplicaReadMixin, APIView):
+    """
+    Profile, current budget, categories and one month's stats in one response.
+    ``?include=profile,stats`` picks sections; ``?month=YYYY-MM`` picks the
+    stats month (default current month).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            sections = parse_sections(request.query_params.get("include"))
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+        query_month = request.query_params.get("month")
         try:
-            query_date = date.fromisoformat(query_month + "-01") if query_month else date.today().replace(day=1)
+            month = parse_month(query_month) if query_month else date.today().replace(day=1)
         except ValueError:
             return Response({"error": "Invalid month format. Use YYYY-MM."}, status=400)
 
-        # Budget
-        budget = (
-            MonthlyBudget.objects.filter(user=user, month=query_date, is_active=True)
-            .values_list("amount", flat=True)
-            .first()
-        ) or 0
-
-        # Transactions for the month
-        transactions = (
-            Transaction.objects.filter(
-                user=user,
-                created_at__year=query_date.year,
-                created_at__month=query_date.month,
-                is_active=True,
-                category__is_active=True  # Optional: if you soft-delete categories
-            )
-            .values(category_type=F("category__type"), category_name=F("category__name"))
-            .annotate(total_amount=Sum("amount"))
-        )
+        user = request.user
+        validators = user_validators(user.id, [Transaction, Category, MonthlyBudget])
+        # The profile is not covered by the row validators, and the budget
+        # section follows today's month.
+        validators += [user.username, user.email, user.first_name, user.last_name]
+        validators += [month, date.today().replace(day=1)]
+        return evaluate(request, validators, lambda: Response(dashboard_payload(user, sections, month)))
 
-        income_categories = []
-        expense_categories = []
-        total_income = 0
-        total_expense = 0
-
-        for item in transactions:
-            data = {
-                "category": item["category_name"],
-                "amount": item["total_amount"]
-            }
-            if item["category_type"] == "income":
-                income_categories.append(data)
-                total_income += item["total_amount"]
-            else:
-                expense_categories.append(data)
-                total_expense += item["total_amount"]
-
-        return Response({
-            "month": query_date.strftime("%Y-%m"),
-            "budget": budget,
-            "total_income": total_income,
-            "total_expense": total_expense,
-            "income_categories": income_categories,
-            "expense_categories": expense_categories
-        })
-
-
-class SoftDeleteModelViewSet(viewsets.ModelViewSet):
+
+class SyncAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = request.query_params.get("since")
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None:
+                return Response({"error": "Invalid since. Use an ISO 8601 timestamp."}, status=400)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+        else:
+            since = None
+        return Response(changes_since(request.user, since, {"request": request}))
+
+
+class CacheStatsView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(caching.counters())
+
+
+class SoftDeleteModelViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         instance.delete()
@@ -91,54 +211,128 @@ class MonthlyBudgetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100  # The maximum number of results per page
 
-class MonthlyBudgetViewSet(viewsets.ModelViewSet):
+class MonthlyBudgetViewSet(ReplicaReadMixin, ConditionalGetMixin, InstrumentedViewMixin, viewsets.ModelViewSet):
     serializer_class = MonthlyBudgetSerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = MonthlyBudgetPagination
+    conditional_models = [MonthlyBudget]
+    replica_actions = ['list']
 
     def get_queryset(self):
         user = self.request.user
-        return MonthlyBudget.objects.filter(user=user, is_active=True).order_by('-month') 
+        return MonthlyBudget.objects.filter(user=user).order_by('-month')
     
     @action(detail=False, methods=['get'], url_path='current-month')
     def get_current_month_budget(self, request):
-        user = request.user
         current_month = date.today().replace(day=1)  # Get the first day of the current month
+        validators = user_validators(request.user.pk, self.conditional_models) + [current_month]
+        return evaluate(request, validators, lambda: self.current_month_response(request, current_month))
+
+    def current_month_response(self, request, current_month):
+        user = request.user
         try:
-            current_budget = MonthlyBudget.objects.get(user=user, month=current_month, is_active=True)
+            current_budget = MonthlyBudget.objects.get(user=user, month=current_month)
             serializer = self.get_serializer(current_budget)
             return Response(serializer.data)
         except MonthlyBudget.DoesNotExist:
             return Response({"detail": "No budget found for the current month."}, status=status.HTTP_404_NOT_FOUND)
 
 
-class CategoryViewSet(SoftDeleteModelViewSet):
+class CategoryViewSet(ReplicaReadMixin, ConditionalGetMixin, SoftDeleteModelViewSet):
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = None
+    conditional_models = [Category]
+    replica_actions = ['list']
     def get_queryset(self):
-        return Category.objects.filter(user=self.request.user, is_active=True)
+        return Category.objects.filter(user=self.request.user)
     def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({
-            "count": len(serializer.data),
-            "next": None,
-            "previous": None,
-            "results": serializer.data
-        })
+        return self.conditional_list(request, self.cached_list_response)
+
+    def cached_list_response(self):
+        request = self.request
+        if request.query_params:
+            return Response(self.list_payload())
+        data, hit = caching.get_or_compute(
+            'categories', caching.categories_key(request.user.id), self.list_payload
+        )
+        response = Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
 
+    def list_payload(self):
+        return category_list_payload(self.filter_queryset(self.get_queryset()))
 
 
-class TransactionViewSet(SoftDeleteModelViewSet):
+
+class TransactionViewSet(ReplicaReadMixin, ConditionalGetMixin, SoftDeleteModelViewSet):
     serializer_class = TransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    # Transactions embed their category, so category edits must change the ETag.
+    conditional_models = [Transaction, Category]
+    conditional_related = ['category']
+    replica_actions = ['list']
+    filter_backends = [DjangoFilterBackend, TransactionSearchFilter]
     filterset_class = TransactionFilter
     search_fields = ['description']
 
+    @property
+    def paginator(self):
+        # Page-number pagination stays the default; ?pagination=cursor switches
+        # this request to keyset pagination on (created_at, id).
+        if not hasattr(self, '_paginator') and KeysetPagination.is_requested(self.request):
+            self._paginator = KeysetPagination()
+        return super().paginator
+
     def get_queryset(self):
-        return Transaction.objects.filter(user=self.request.user, is_active=True).order_by('-created_at')
+        return (
+            Transaction.objects.filter(user=self.request.user)
+            .select_related('category')
+            .order_by('-created_at', '-id')
+        )
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_list(request, self.list_response)
+
+    def list_response(self):
+        # Lists are read from values_list rows; see tracker.listing.
+        rows = transaction_reader.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        with serialize_timer(self.request):
+            data = transaction_reader.read(rows if page is None else page)
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        # ``format`` is reserved by DRF for renderer negotiation.
+        file_format = request.query_params.get('file_format', 'csv')
+        exporter = EXPORTERS.get(file_format)
+        if exporter is None:
+            raise serializers.ValidationError({'file_format': f'Choose one of: {", ".join(EXPORTERS)}.'})
+        return exporter(self.filter_queryset(self.get_queryset()))
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[ORJSONParser, MultiPartParser])
+    def bulk_import(self, request):
+        rows = read_rows(request.data, upload=request.FILES.get('file'))
+        report = import_transactions(request.user, rows)
+        status_code = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+        return Response(report, status=status_code)
+
+    # Batch actions take {"ids": [...]} or {"filter": {...list filters...}} and
+    # change every selected row with a single UPDATE.
+    @action(detail=False, methods=['post'], url_path='bulk-update')
+    def bulk_update(self, request):
+        queryset = select_transactions(request.user, request.data)
+        changes = TransactionBatchChangesSerializer(data=request.data.get('changes'), context={'request': request})
+        changes.is_valid(raise_exception=True)
+        return Response({'updated': update_transactions(request.user, queryset, changes.validated_data)})
+
+    @action(detail=False, methods=['post'], url_path='bulk-delete')
+    def bulk_delete(self, request):
+        queryset = select_transactions(request.user, request.data)
+        return Response({'deleted': delete_transactions(request.user, queryset)})
 
 class RegisterUserView(generics.CreateAPIView):
     queryset = User.objects.all()
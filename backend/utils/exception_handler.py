@@ -1,8 +1,29 @@
+from django.db import IntegrityError
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+# Unique constraints that stand in for serializer validation, and the error
+# each one reports when an insert or update violates it.
+CONSTRAINT_ERRORS = {
+    'category_user_lower_name_uniq': {'name': 'Category with this name already exists for this user.'},
+}
+
+
+def constraint_error(exc):
+    # PostgreSQL and SQLite both name the violated constraint in the message.
+    message = str(exc)
+    for constraint, detail in CONSTRAINT_ERRORS.items():
+        if constraint in message:
+            return ValidationError(detail)
+    return None
+
 
 def custom_exception_handler(exc, context):
+    if isinstance(exc, IntegrityError):
+        exc = constraint_error(exc) or exc
+
     response = exception_handler(exc, context)
 
     if response is not None: